@@ -52,12 +52,57 @@ def get_default_config() -> Dict[str, Any]:
     }
 
 
+def normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill in missing settings from the defaults and coerce known fields to their types
+    
+    Afterwards every section and field of the default configuration exists,
+    so callers can index the config directly (config['risk']['stop_loss'])
+    instead of chaining .get() calls with fallbacks. Unknown keys are kept.
+    
+    Args:
+        config: Configuration dictionary as read from disk
+        
+    Returns:
+        Normalized configuration dictionary
+    """
+    return _merge_defaults(get_default_config(), config, "")
+
+
+def _merge_defaults(defaults: Dict[str, Any], config: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+    """Recursively merge a config section over its defaults, validating scalar fields"""
+    merged = dict(config)
+    for key, default in defaults.items():
+        if key not in merged:
+            merged[key] = default
+            continue
+        
+        value = merged[key]
+        if isinstance(default, dict):
+            if isinstance(value, dict):
+                merged[key] = _merge_defaults(default, value, f"{prefix}{key}.")
+            else:
+                logger.warning(f"Invalid config section {prefix}{key}, using defaults")
+                merged[key] = default
+        elif isinstance(default, bool):
+            if not isinstance(value, bool):
+                logger.warning(f"Invalid config value {prefix}{key}={value!r}, using {default!r}")
+                merged[key] = default
+        elif isinstance(default, (int, float)):
+            try:
+                merged[key] = type(default)(value)
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid config value {prefix}{key}={value!r}, using {default!r}")
+                merged[key] = default
+    return merged
+
+
 def load_config() -> Optional[Dict[str, Any]]:
     """Load user configuration or create default"""
     try:
         if USER_CONFIG_PATH.exists():
             with open(USER_CONFIG_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+                config = normalize_config(json.load(f))
                 logger.info(f"Loaded configuration from {USER_CONFIG_PATH}")
                 return config
         else:
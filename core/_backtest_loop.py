@@ -0,0 +1,240 @@
+"""
+Compiled simulation loop for the Backtester
+
+The kernels are declared with explicit numba signatures, so they are
+compiled when this module is imported (and loaded from the on-disk cache
+after the first run) rather than on the first backtest, and calls skip
+type dispatch. Callers must pass C-contiguous arrays of the declared dtypes.
+"""
+
+import numpy as np
+from core.strategy import HOLD, BUY, SELL
+from utils._njit import njit, NUMBA_AVAILABLE
+
+TRADE_DTYPE = np.dtype([
+    ('id', np.int32),
+    ('side', np.int8),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('amount', np.float64),
+    ('pnl', np.float64),
+    ('entry_i', np.int32),
+    ('exit_i', np.int32)
+])
+
+if NUMBA_AVAILABLE:
+    from numba import from_dtype, types
+    
+    SIMULATE_SIGNATURE = types.Tuple((types.float64[::1], types.int64))(
+        types.float64[::1], types.int8[::1], types.float64[::1], from_dtype(TRADE_DTYPE)[::1],
+        types.int64, types.float64, types.float64, types.float64, types.float64, types.float64
+    )
+    DRAWDOWN_SHARPE_SIGNATURE = types.UniTuple(types.float64, 2)(types.float64[::1], types.float64)
+else:
+    SIMULATE_SIGNATURE = DRAWDOWN_SHARPE_SIGNATURE = None
+
+
+@njit(SIMULATE_SIGNATURE, cache=True)
+def simulate(closes, actions, confs, trades, start, stop_loss, take_profit,
+             max_position_size, initial_balance, threshold):
+    """
+    Simulate the strategy bar by bar
+
+    Mirrors the per-bar logic of the Backtester: check stop loss / take profit
+    on open positions, open a new position when the signal passes the
+    confidence threshold, then mark equity to market. Stretches of bars with
+    no open positions and no tradeable signal are skipped. Positions still
+    open after the last bar are closed at the final close.
+
+    Args:
+        closes: Close price per bar
+        actions: Signal action code per bar (HOLD, BUY or SELL)
+        confs: Signal confidence per bar
+        trades: Preallocated TRADE_DTYPE array (one slot per bar), filled in place
+        start: First bar to trade on
+        stop_loss: Stop loss fraction
+        take_profit: Take profit fraction
+        max_position_size: Max position size as a fraction of balance
+        initial_balance: Starting balance
+        threshold: Minimum confidence to execute a trade
+
+    Returns:
+        Tuple of (equity per bar, number of trades written)
+    """
+    n = closes.shape[0]
+    equity = np.empty(n)
+    equity[:start] = initial_balance
+
+    # Open positions as parallel arrays (structure of arrays)
+    pos_id = np.empty(n, dtype=np.int32)
+    pos_sign = np.empty(n)  # +1 long (buy), -1 short (sell)
+    pos_entry = np.empty(n)
+    pos_stop = np.empty(n)
+    pos_target = np.empty(n)
+    pos_amount = np.empty(n)
+    pos_entry_i = np.empty(n, dtype=np.int32)
+    open_mask = np.zeros(n, dtype=np.bool_)
+    n_pos = 0
+    n_trades = 0
+    balance = initial_balance
+
+    # Unrealized PnL of open positions is price * net_amount - net_cost, with
+    # net_amount = sum(sign * amount) and net_cost = sum(sign * amount * entry)
+    net_amount = 0.0
+    net_cost = 0.0
+
+    # Next bar with a tradeable signal, used to skip idle stretches
+    next_active = np.empty(n + 1, dtype=np.int64)
+    next_active[n] = n
+    for i in range(n - 1, -1, -1):
+        if actions[i] != HOLD and confs[i] >= threshold:
+            next_active[i] = i
+        else:
+            next_active[i] = next_active[i + 1]
+
+    i = start
+    while i < n:
+        # No open positions and no signal: equity stays at balance until the next signal
+        if n_pos == 0 and next_active[i] > i:
+            equity[i:next_active[i]] = balance
+            i = next_active[i]
+            if i >= n:
+                break
+
+        price = closes[i]
+
+        # Close positions if stop loss or take profit hit
+        n_closed = 0
+        for j in range(n_pos):
+            sign = pos_sign[j]
+            if sign * (price - pos_stop[j]) > 0 and sign * (price - pos_target[j]) < 0:
+                continue
+
+            entry = pos_entry[j]
+            pnl = sign * (price - entry) * pos_amount[j]
+            balance += pos_amount[j] * price + pnl
+
+            trades[n_trades]['id'] = pos_id[j]
+            trades[n_trades]['side'] = BUY if sign > 0 else SELL
+            trades[n_trades]['entry_price'] = entry
+            trades[n_trades]['exit_price'] = price
+            trades[n_trades]['amount'] = pos_amount[j]
+            trades[n_trades]['pnl'] = pnl
+            trades[n_trades]['entry_i'] = pos_entry_i[j]
+            trades[n_trades]['exit_i'] = i
+            n_trades += 1
+
+            open_mask[j] = False
+            n_closed += 1
+
+        # Drop closed positions in one stable pass, keeping open order
+        if n_closed > 0:
+            k = 0
+            net_amount = 0.0
+            net_cost = 0.0
+            for j in range(n_pos):
+                if open_mask[j]:
+                    net_amount += pos_sign[j] * pos_amount[j]
+                    net_cost += pos_sign[j] * pos_amount[j] * pos_entry[j]
+                    pos_id[k] = pos_id[j]
+                    pos_sign[k] = pos_sign[j]
+                    pos_entry[k] = pos_entry[j]
+                    pos_stop[k] = pos_stop[j]
+                    pos_target[k] = pos_target[j]
+                    pos_amount[k] = pos_amount[j]
+                    pos_entry_i[k] = pos_entry_i[j]
+                    open_mask[k] = True
+                    k += 1
+            open_mask[k:n_pos] = False
+            n_pos = k
+
+        # Execute trade if signal is strong enough
+        action = actions[i]
+        if action != HOLD and confs[i] >= threshold:
+            amount = balance * max_position_size
+            cost = amount * price
+            required = cost if action == BUY else amount
+            if amount > 0 and cost <= balance and required <= balance and cost <= balance * max_position_size:
+                pos_id[n_pos] = n_pos + 1
+                sign = 1.0 if action == BUY else -1.0
+                pos_sign[n_pos] = sign
+                pos_entry[n_pos] = price
+                # Stop loss / take profit prices are fixed at open
+                pos_stop[n_pos] = price * (1 - sign * stop_loss)
+                pos_target[n_pos] = price * (1 + sign * take_profit)
+                pos_amount[n_pos] = amount
+                pos_entry_i[n_pos] = i
+                open_mask[n_pos] = True
+                n_pos += 1
+                net_amount += sign * amount
+                net_cost += sign * amount * price
+                balance -= cost
+
+        # Update equity curve
+        equity[i] = balance + (price * net_amount - net_cost)
+        i += 1
+
+    # Close all remaining positions
+    price = closes[n - 1]
+    for j in range(n_pos):
+        pnl = pos_sign[j] * (price - pos_entry[j]) * pos_amount[j]
+
+        trades[n_trades]['id'] = pos_id[j]
+        trades[n_trades]['side'] = BUY if pos_sign[j] > 0 else SELL
+        trades[n_trades]['entry_price'] = pos_entry[j]
+        trades[n_trades]['exit_price'] = price
+        trades[n_trades]['amount'] = pos_amount[j]
+        trades[n_trades]['pnl'] = pnl
+        trades[n_trades]['entry_i'] = pos_entry_i[j]
+        trades[n_trades]['exit_i'] = n - 1
+        n_trades += 1
+
+    return equity, n_trades
+
+
+@njit(DRAWDOWN_SHARPE_SIGNATURE, cache=True)
+def drawdown_sharpe(equity, periods_per_year):
+    """
+    Max drawdown and Sharpe ratio of an equity curve in a single pass
+
+    Tracks the running peak for the drawdown and a running mean / sum of
+    squared deviations (Welford) of bar-to-bar returns for the Sharpe ratio.
+
+    Args:
+        equity: Equity value per bar
+        periods_per_year: Annualization factor for the Sharpe ratio
+
+    Returns:
+        Tuple of (max drawdown in percent, annualized Sharpe ratio)
+    """
+    n = equity.shape[0]
+    if n == 0:
+        return 0.0, 0.0
+
+    running_max = equity[0]
+    min_drawdown = 0.0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(1, n):
+        value = equity[i]
+        prev = equity[i - 1]
+
+        if value > running_max:
+            running_max = value
+        drawdown = (value - running_max) / running_max * 100
+        if drawdown < min_drawdown:
+            min_drawdown = drawdown
+
+        ret = (value - prev) / prev
+        delta = ret - mean
+        mean += delta / i
+        m2 += delta * (ret - mean)
+
+    sharpe = 0.0
+    if n > 1:
+        std = np.sqrt(m2 / (n - 1))
+        if std > 0:
+            sharpe = mean / std * np.sqrt(periods_per_year)
+
+    return abs(min_drawdown), sharpe
@@ -36,6 +36,10 @@ logger = setup_logger(__name__)
 MODELS_DIR = Path(__file__).parent.parent / "models"
 MODELS_DIR.mkdir(exist_ok=True)
 
+# Input dtype of the LSTM, which computes in float32; indicators stay float64
+# upstream since float32 can't resolve IRT price levels
+LSTM_DTYPE = np.float32
+
 
 class AIModel:
     """AI/ML model for trading predictions"""
@@ -98,9 +102,10 @@ class AIModel:
             if col in df.columns:
                 feature_list.append(col)
         
-        # Volume features
+        # Volume features (against the 20-bar volume SMA the indicator kernel already computed)
         if 'volume' in df.columns:
-            df['volume_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
+            volume_sma = df['volume_sma'] if 'volume_sma' in df.columns else df['volume'].rolling(20).mean()
+            df['volume_ratio'] = df['volume'] / volume_sma
             feature_list.append('volume_ratio')
         
         # Create target (next period price direction)
@@ -217,14 +222,9 @@ class AIModel:
             # Scale features
             X_scaled = self.scaler.fit_transform(X)
             
-            # Create sequences
-            X_seq, y_seq = [], []
-            for i in range(self.sequence_length, len(X_scaled)):
-                X_seq.append(X_scaled[i-self.sequence_length:i])
-                y_seq.append(y.iloc[i])
-            
-            X_seq = np.array(X_seq)
-            y_seq = np.array(y_seq)
+            # Create sequences: the window ending before row i predicts row i's target
+            X_seq = self._lstm_windows(X_scaled, self.sequence_length)[:-1]
+            y_seq = y.to_numpy(dtype=LSTM_DTYPE)[self.sequence_length:]
             
             # Split data
             split_idx = int(len(X_seq) * 0.8)
@@ -352,7 +352,7 @@ class AIModel:
             
             # Get sequence
             X_scaled = self.scaler.transform(X)
-            X_seq = X_scaled[-self.sequence_length:].reshape(1, self.sequence_length, -1)
+            X_seq = X_scaled[-self.sequence_length:].astype(LSTM_DTYPE).reshape(1, self.sequence_length, -1)
             
             # Predict
             prediction = self.lstm_model.predict(X_seq, verbose=0)[0][0]
@@ -371,6 +371,115 @@ class AIModel:
             logger.error(f" Error in LSTM prediction: {e}")
             return {'action': 'hold', 'confidence': 0.0, 'reason': str(e)}
     
+    def predict_ml_batch(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get ML predictions for every row of a historical DataFrame at once
+        
+        Row i holds what predict_ml(df.iloc[:i+1]) would return, computed
+        with a single model call over the whole feature matrix.
+        
+        Args:
+            df: Historical market data
+        
+        Returns:
+            Tuple of (ml_score, confidence) arrays aligned with df rows.
+            Rows without a prediction have confidence 0.
+        """
+        n = len(df)
+        scores = np.full(n, 0.5)
+        confidences = np.zeros(n)
+        
+        try:
+            # Positional index (a copy of df), so feature rows map back to df rows even
+            # when candle timestamps repeat
+            X, _ = self.prepare_features(df.reset_index(drop=True))
+            models = [m for m in (self.rf_model, self.xgb_model) if m]
+            
+            if X.empty or not models:
+                return scores, confidences
+            
+            # prepare_features needs 20 valid rows before predict_ml returns anything
+            X = X.iloc[19:]
+            X_scaled = self.scaler.transform(X.values)
+            
+            predictions = np.mean([m.predict(X_scaled) for m in models], axis=0)
+            probas = np.mean([m.predict_proba(X_scaled).max(axis=1) for m in models], axis=0)
+            
+            rows = X.index.to_numpy()
+            return (
+                self._forward_fill(rows, predictions, n, 0.5),
+                self._forward_fill(rows, probas, n, 0.0)
+            )
+        
+        except Exception as e:
+            logger.error(f" Error in batch ML prediction: {e}")
+            return scores, confidences
+    
+    def predict_lstm_batch(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get LSTM predictions for every row of a historical DataFrame at once
+        
+        Args:
+            df: Historical market data
+        
+        Returns:
+            Tuple of (lstm_score, confidence) arrays aligned with df rows.
+            Rows without a prediction have confidence 0.
+        """
+        n = len(df)
+        scores = np.full(n, 0.5)
+        confidences = np.zeros(n)
+        
+        try:
+            if self.lstm_model is None:
+                return scores, confidences
+            
+            # Positional index (a copy of df), so feature rows map back to df rows even
+            # when candle timestamps repeat
+            X, _ = self.prepare_features(df.reset_index(drop=True))
+            
+            if len(X) < self.sequence_length:
+                return scores, confidences
+            
+            # One sliding window per row that has a full sequence behind it
+            X_scaled = self.scaler.transform(X.values)
+            windows = self._lstm_windows(X_scaled, self.sequence_length)
+            
+            predictions = self.lstm_model.predict(windows, verbose=0)[:, 0]
+            
+            rows = X.index.to_numpy()[self.sequence_length - 1:]
+            predictions = self._forward_fill(rows, predictions, n, 0.5)
+            return predictions, np.abs(predictions - 0.5) * 2
+        
+        except Exception as e:
+            logger.error(f" Error in batch LSTM prediction: {e}")
+            return scores, confidences
+    
+    @staticmethod
+    def _lstm_windows(X_scaled: np.ndarray, length: int) -> np.ndarray:
+        """
+        Every window of length consecutive rows, as one contiguous LSTM_DTYPE block
+        
+        Converting once here saves TensorFlow a float64 -> float32 cast of
+        every batch.
+        
+        Args:
+            X_scaled: Scaled feature matrix (rows x features)
+            length: Window length
+        
+        Returns:
+            Array of shape (rows - length + 1, length, features)
+        """
+        windows = np.lib.stride_tricks.sliding_window_view(X_scaled, length, axis=0).transpose(0, 2, 1)
+        return np.ascontiguousarray(windows, dtype=LSTM_DTYPE)
+    
+    @staticmethod
+    def _forward_fill(rows: np.ndarray, values: np.ndarray, n: int, fill: float) -> np.ndarray:
+        """Spread values onto n rows, carrying the last prediction forward"""
+        out = pd.Series(np.nan, index=range(n))
+        out.iloc[rows] = values
+        return out.ffill().fillna(fill).to_numpy()
+    
     def load_models(self, symbol: str) -> bool:
         """
         Load saved models
@@ -4,9 +4,10 @@ Backtesting System for Pishgoo
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 from datetime import datetime
-from core.strategy import HybridAIStrategy
+from core.strategy import HybridAIStrategy, ACTIONS
+from core._backtest_loop import simulate, drawdown_sharpe, TRADE_DTYPE
 from core.data_fetcher import DataFetcher
 from core.risk_manager import RiskManager
 from utils.logger import setup_logger
@@ -28,9 +29,8 @@ class Backtester:
         self.strategy = strategy
         self.initial_balance = initial_balance
         self.balance = initial_balance
-        self.positions: List[Dict] = []
-        self.trades: List[Dict] = []
-        self.equity_curve: List[float] = [initial_balance]
+        self.trades: np.ndarray = np.zeros(0, dtype=TRADE_DTYPE)
+        self.equity_curve: np.ndarray = np.full(1, initial_balance, dtype=np.float64)
         logger.info(f" Backtester initialized with balance: {initial_balance:,.0f} IRT")
     
     def run_backtest(self, df: pd.DataFrame, symbol: str, start_date: Optional[str] = None,
@@ -62,46 +62,39 @@ class Backtester:
             
             # Reset state
             self.balance = self.initial_balance
-            self.positions = []
-            self.trades = []
-            self.equity_curve = [self.initial_balance]
+            self.trades = np.zeros(0, dtype=TRADE_DTYPE)
             
-            # Iterate through data
-            for i in range(50, len(df)):  # Start from index 50 to have enough history
-                current_data = df.iloc[:i+1]
-                current_price = df.iloc[i]['close']
-                current_time = df.index[i]
-                
-                # Close positions if stop loss or take profit hit
-                self._check_exit_conditions(current_price, current_time)
-                
-                # Generate signal
-                # Temporarily set data_fetcher data for strategy
-                old_cache = self.strategy.data_fetcher._cache
-                self.strategy.data_fetcher._cache = {f"{symbol}_1h": (0, current_data)}
-                
-                try:
-                    signal = self.strategy.generate_signal(symbol)
-                except:
-                    signal = {'action': 'hold', 'confidence': 0.0}
-                
-                # Restore cache
-                self.strategy.data_fetcher._cache = old_cache
-                
-                # Execute trade if signal is strong enough
-                if self.strategy.should_execute_trade(signal, symbol):
-                    self._execute_trade(signal, symbol, current_price, current_time)
-                
-                # Update equity curve
-                self._update_equity(current_price)
+            # Precompute indicators, model votes and final signals once over the whole frame
+            features = self.strategy.precompute_features(df, symbol)
+            actions, confidences = self.strategy.generate_signal_arrays(features)
+            risk_manager = self.strategy.risk_manager
             
-            # Close all remaining positions
-            final_price = df.iloc[-1]['close']
-            for pos in self.positions:
-                self._close_position(pos, final_price, df.index[-1])
+            # Start from index 50 to have enough history, and not before the indicators are defined
+            valid = features['valid']
+            start = max(50, int(np.argmax(valid)) if valid.any() else len(df))
+            if start >= len(df):
+                logger.warning(" Indicators are never fully defined, nothing to backtest")
+                return self._empty_results()
+            
+            # Run the compiled simulation loop
+            trades = np.zeros(len(df), dtype=TRADE_DTYPE)
+            equity, n_trades = simulate(
+                df['close'].to_numpy(dtype=np.float64, copy=True),
+                np.ascontiguousarray(actions, dtype=np.int8),
+                np.ascontiguousarray(confidences, dtype=np.float64),
+                trades, int(start),
+                float(risk_manager.stop_loss), float(risk_manager.take_profit),
+                float(risk_manager.max_position_size), float(self.initial_balance),
+                float(self.strategy.confidence_threshold)
+            )
+            
+            # Equity curve is the initial balance followed by one value per simulated bar
+            self.equity_curve = equity[49:]
+            self.balance = float(self.equity_curve[-1])
+            self.trades = trades[:n_trades]
             
             # Calculate metrics
-            results = self._calculate_metrics(df)
+            results = self._calculate_metrics(self._trades_frame(df.index, symbol, confidences))
             logger.info(f" Backtest completed. Total return: {results['total_return']:.2f}%")
             
             return results
@@ -110,149 +103,54 @@ class Backtester:
             logger.error(f" Backtest error: {e}")
             return self._empty_results()
     
-    def _execute_trade(self, signal: Dict, symbol: str, price: float, timestamp: pd.Timestamp):
-        """Execute a trade"""
-        if signal['action'] == 'hold':
-            return
-        
-        # Calculate position size
-        position_size = self.strategy.risk_manager.calculate_position_size(
-            self.balance, price
-        )
-        
-        if position_size <= 0:
-            return
-        
-        # Check if we can afford the trade
-        cost = position_size * price
-        if cost > self.balance:
-            return
-        
-        # Validate order
-        validation = self.strategy.risk_manager.validate_order(
-            signal['action'], position_size, price, self.balance
-        )
-        
-        if not validation['valid']:
-            return
-        
-        # Create position
-        position = {
-            'id': len(self.positions) + 1,
+    def _trades_frame(self, times: pd.DatetimeIndex, symbol: str, confidences: np.ndarray) -> pd.DataFrame:
+        """Build the trade history DataFrame column by column from the trades array"""
+        trades = self.trades
+        entry_time = times[trades['entry_i']]
+        exit_time = times[trades['exit_i']]
+        
+        return pd.DataFrame({
+            'id': trades['id'],
             'symbol': symbol,
-            'side': signal['action'],
-            'entry_price': price,
-            'amount': position_size,
-            'entry_time': timestamp,
-            'stop_loss': self.strategy.risk_manager.calculate_stop_loss_price(price, signal['action']),
-            'take_profit': self.strategy.risk_manager.calculate_take_profit_price(price, signal['action']),
-            'signal': signal
-        }
-        
-        self.positions.append(position)
-        self.balance -= cost
-        
-        logger.debug(f" Position opened: {signal['action']} {position_size:.4f} {symbol} @ {price:,.0f}")
+            'side': np.array(ACTIONS)[trades['side']],
+            'entry_price': trades['entry_price'],
+            'exit_price': trades['exit_price'],
+            'amount': trades['amount'],
+            'pnl': trades['pnl'],
+            'pnl_pct': (trades['pnl'] / (trades['entry_price'] * trades['amount'])) * 100,
+            'entry_time': entry_time,
+            'exit_time': exit_time,
+            'duration': (exit_time - entry_time).total_seconds().to_numpy() / 3600,  # hours
+            'confidence': confidences[trades['entry_i']]
+        })
     
-    def _check_exit_conditions(self, current_price: float, timestamp: pd.Timestamp):
-        """Check stop loss and take profit conditions"""
-        positions_to_close = []
-        
-        for pos in self.positions:
-            triggered = False
-            
-            # Check stop loss
-            if self.strategy.risk_manager.check_stop_loss(
-                pos['entry_price'], current_price, pos['side']
-            ):
-                triggered = True
-            
-            # Check take profit
-            if self.strategy.risk_manager.check_take_profit(
-                pos['entry_price'], current_price, pos['side']
-            ):
-                triggered = True
-            
-            if triggered:
-                positions_to_close.append(pos)
-        
-        for pos in positions_to_close:
-            self._close_position(pos, current_price, timestamp)
-    
-    def _close_position(self, position: Dict, exit_price: float, timestamp: pd.Timestamp):
-        """Close a position"""
-        if position['side'] == 'buy':
-            pnl = (exit_price - position['entry_price']) * position['amount']
-        else:  # sell
-            pnl = (position['entry_price'] - exit_price) * position['amount']
-        
-        self.balance += (position['amount'] * exit_price) + pnl
-        
-        trade = {
-            'id': position['id'],
-            'symbol': position['symbol'],
-            'side': position['side'],
-            'entry_price': position['entry_price'],
-            'exit_price': exit_price,
-            'amount': position['amount'],
-            'pnl': pnl,
-            'pnl_pct': (pnl / (position['entry_price'] * position['amount'])) * 100,
-            'entry_time': position['entry_time'],
-            'exit_time': timestamp,
-            'duration': (timestamp - position['entry_time']).total_seconds() / 3600,  # hours
-            'signal': position['signal']
-        }
-        
-        self.trades.append(trade)
-        self.positions.remove(position)
-        
-        logger.debug(f" Position closed: {trade['side']} {trade['amount']:.4f} @ {exit_price:,.0f} | PnL: {pnl:,.0f} ({trade['pnl_pct']:.2f}%)")
-    
-    def _update_equity(self, current_price: float):
-        """Update equity curve"""
-        equity = self.balance
-        
-        # Add unrealized PnL from open positions
-        for pos in self.positions:
-            if pos['side'] == 'buy':
-                equity += (current_price - pos['entry_price']) * pos['amount']
-            else:  # sell
-                equity += (pos['entry_price'] - current_price) * pos['amount']
-        
-        self.equity_curve.append(equity)
-    
-    def _calculate_metrics(self, df: pd.DataFrame) -> Dict:
+    def _calculate_metrics(self, trades_df: pd.DataFrame) -> Dict:
         """Calculate backtest performance metrics"""
-        if not self.trades:
+        if trades_df.empty:
             return self._empty_results()
         
-        trades_df = pd.DataFrame(self.trades)
-        
         # Total return
         total_return = ((self.equity_curve[-1] - self.initial_balance) / self.initial_balance) * 100
         
         # Win rate
-        winning_trades = len(trades_df[trades_df['pnl'] > 0])
-        total_trades = len(trades_df)
+        pnl = self.trades['pnl']
+        wins_mask = pnl > 0
+        losses_mask = pnl < 0
+        winning_trades = int(wins_mask.sum())
+        losing_count = int(losses_mask.sum())
+        total_trades = len(pnl)
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
         # Average win/loss
-        avg_win = trades_df[trades_df['pnl'] > 0]['pnl'].mean() if winning_trades > 0 else 0
-        avg_loss = abs(trades_df[trades_df['pnl'] < 0]['pnl'].mean()) if len(trades_df[trades_df['pnl'] < 0]) > 0 else 0
+        avg_win = pnl[wins_mask].mean() if winning_trades > 0 else 0
+        avg_loss = -pnl[losses_mask].mean() if losing_count > 0 else 0
         profit_factor = (avg_win * winning_trades) / (avg_loss * (total_trades - winning_trades)) if avg_loss > 0 and (total_trades - winning_trades) > 0 else 0
         
-        # Max drawdown
-        equity_array = np.array(self.equity_curve)
-        running_max = np.maximum.accumulate(equity_array)
-        drawdown = ((equity_array - running_max) / running_max) * 100
-        max_drawdown = abs(drawdown.min())
-        
-        # Sharpe ratio (simplified)
-        returns = np.diff(equity_array) / equity_array[:-1]
-        sharpe_ratio = (returns.mean() / returns.std() * np.sqrt(252)) if returns.std() > 0 else 0
+        # Max drawdown and Sharpe ratio (simplified) in one pass over the equity curve
+        max_drawdown, sharpe_ratio = drawdown_sharpe(np.ascontiguousarray(self.equity_curve), 252.0)
         
         # Total PnL
-        total_pnl = trades_df['pnl'].sum()
+        total_pnl = pnl.sum()
         
         return {
             'total_return': float(total_return),
@@ -269,7 +167,7 @@ class Backtester:
             'max_drawdown': float(max_drawdown),
             'sharpe_ratio': float(sharpe_ratio),
             'equity_curve': self.equity_curve,
-            'trades': trades_df.to_dict('records')
+            'trades': trades_df
         }
     
     def _empty_results(self) -> Dict:
@@ -288,8 +186,8 @@ class Backtester:
             'profit_factor': 0.0,
             'max_drawdown': 0.0,
             'sharpe_ratio': 0.0,
-            'equity_curve': [self.initial_balance],
-            'trades': []
+            'equity_curve': np.full(1, self.initial_balance, dtype=np.float64),
+            'trades': pd.DataFrame()
         }
 
 
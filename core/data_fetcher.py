@@ -4,9 +4,9 @@ Data Fetcher - Fetch and prepare market data
 
 import pandas as pd
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from core.exchange_manager import ExchangeManager
-from utils.indicators import TechnicalIndicators
+from utils.indicators import TechnicalIndicators, IncrementalIndicators
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -15,16 +15,19 @@ logger = setup_logger(__name__)
 class DataFetcher:
     """Fetch and prepare market data with indicators"""
     
-    def __init__(self, exchange_manager: ExchangeManager):
+    def __init__(self, exchange_manager: ExchangeManager, incremental_indicators: bool = False):
         """
         Initialize data fetcher
         
         Args:
             exchange_manager: Exchange manager instance
+            incremental_indicators: Keep indicator state per symbol and timeframe and only
+                compute new candles on each fetch (see IncrementalIndicators)
         """
         self.exchange_manager = exchange_manager
         self.indicators = TechnicalIndicators()
         self._cache: Dict[str, Dict] = {}
+        self._incremental: Optional[Dict[str, IncrementalIndicators]] = {} if incremental_indicators else None
         logger.info("Data fetcher initialized")
     
     def get_market_data(self, symbol: str, timeframe: str = "1h", 
@@ -43,38 +46,90 @@ class DataFetcher:
         """
         try:
             # Check cache
-            cache_key = f"{symbol}_{timeframe}"
-            if cache_key in self._cache:
-                cached_time, cached_data = self._cache[cache_key]
-                if time.time() - cached_time < 60:  # 1 minute cache
-                    logger.debug(f"Using cached data for {symbol}")
-                    return cached_data.copy()
+            cached = self._get_cached(symbol, timeframe, include_indicators)
+            if cached is not None:
+                logger.debug(f"Using cached data for {symbol}")
+                return cached
             
             # Fetch from exchange
             df = self.exchange_manager.get_ohlcv(symbol, timeframe, limit)
-            
-            if df.empty:
-                logger.warning(f"No data for {symbol}")
-                return None
-            
-            # Ensure correct column names
-            if 'open' not in df.columns:
-                df.columns = ['open', 'high', 'low', 'close', 'volume']
-            
-            # Calculate indicators
-            if include_indicators:
-                df = self.indicators.calculate_all(df)
-            
-            # Cache the data
-            self._cache[cache_key] = (time.time(), df.copy())
-            
-            logger.info(f"Market data fetched: {symbol} ({len(df)} candles)")
-            return df
+            return self._prepare(symbol, timeframe, df, include_indicators)
             
         except Exception as e:
             logger.error(f"Error fetching market data for {symbol}: {e}")
             return None
     
+    def get_market_data_many(self, symbols: List[str], timeframe: str = "1h", limit: int = 200,
+                             include_indicators: bool = True) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Get market data for several symbols, fetching the uncached ones concurrently
+        
+        Args:
+            symbols: Trading pair symbols
+            timeframe: Timeframe (1h, 4h, 1d)
+            limit: Number of candles
+            include_indicators: Whether to calculate indicators
+            
+        Returns:
+            Dictionary mapping symbol to its DataFrame (None if no data)
+        """
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+        for symbol in symbols:
+            results[symbol] = self._get_cached(symbol, timeframe, include_indicators)
+        
+        missing = [symbol for symbol, df in results.items() if df is None]
+        if missing:
+            try:
+                frames = self.exchange_manager.get_ohlcv_many(missing, timeframe, limit)
+            except Exception as e:
+                logger.error(f"Error fetching market data for {missing}: {e}")
+                frames = {}
+            
+            for symbol in missing:
+                try:
+                    results[symbol] = self._prepare(symbol, timeframe, frames.get(symbol), include_indicators)
+                except Exception as e:
+                    logger.error(f"Error preparing market data for {symbol}: {e}")
+        
+        return results
+    
+    def _get_cached(self, symbol: str, timeframe: str, include_indicators: bool) -> Optional[pd.DataFrame]:
+        """Copy of the cached data for a symbol if it is less than a minute old"""
+        cache_key = f"{symbol}_{timeframe}_{'ind' if include_indicators else 'raw'}"
+        if cache_key in self._cache:
+            cached_time, cached_data = self._cache[cache_key]
+            if time.time() - cached_time < 60:  # 1 minute cache
+                return cached_data.copy()
+        return None
+    
+    def _prepare(self, symbol: str, timeframe: str, df: Optional[pd.DataFrame],
+                 include_indicators: bool) -> Optional[pd.DataFrame]:
+        """Normalize fetched OHLCV data, add indicators and cache it"""
+        if df is None or df.empty:
+            logger.warning(f"No data for {symbol}")
+            return None
+        
+        # Ensure correct column names
+        if 'open' not in df.columns:
+            df.columns = ['open', 'high', 'low', 'close', 'volume']
+        
+        # Calculate indicators
+        if include_indicators:
+            if self._incremental is not None:
+                series_key = f"{symbol}_{timeframe}"
+                if series_key not in self._incremental:
+                    self._incremental[series_key] = IncrementalIndicators()
+                df = self._incremental[series_key].update(df)
+            else:
+                df = self.indicators.calculate_all(df)
+        
+        # Cache the data
+        cache_key = f"{symbol}_{timeframe}_{'ind' if include_indicators else 'raw'}"
+        self._cache[cache_key] = (time.time(), df.copy())
+        
+        logger.info(f"Market data fetched: {symbol} ({len(df)} candles)")
+        return df
+    
     def get_current_price(self, symbol: str) -> float:
         """Get current price for a symbol"""
         try:
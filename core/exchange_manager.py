@@ -2,7 +2,8 @@
 Exchange Manager - Unified interface for multiple exchanges
 """
 
-from typing import Dict, Optional
+import pandas as pd
+from typing import Dict, List, Optional
 from exchanges.base import BaseExchange
 from exchanges.nobitex import NobitexExchange
 from exchanges.wallex import WallexExchange
@@ -59,6 +60,13 @@ class ExchangeManager:
             return None
         return self.exchange.get_ohlcv(symbol, timeframe, limit)
     
+    def get_ohlcv_many(self, symbols: List[str], timeframe: str = "1h", limit: int = 100) -> Dict[str, pd.DataFrame]:
+        """Get OHLCV data for several symbols concurrently"""
+        if not self.exchange:
+            logger.error("Exchange not initialized")
+            return {}
+        return self.exchange.get_ohlcv_many(symbols, timeframe, limit)
+    
     def place_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None):
         """Place an order"""
         if not self.exchange:
@@ -86,4 +94,9 @@ class ExchangeManager:
             logger.error("Exchange not initialized")
             return {}
         return self.exchange.get_ticker(symbol)
+    
+    def clear_cache(self) -> None:
+        """Drop the exchange's cached market data"""
+        if self.exchange:
+            self.exchange.clear_cache()
 
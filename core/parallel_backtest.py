@@ -0,0 +1,74 @@
+"""
+Parallel portfolio backtesting for Pishgoo
+"""
+
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from core.backtester import Backtester
+from core.strategy import HybridAIStrategy
+from core.risk_manager import RiskManager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _backtest_worker(symbol: str, df: pd.DataFrame, config: Dict, initial_balance: float) -> Dict:
+    """
+    Backtest a single symbol in a worker process
+
+    The strategy is rebuilt from the config inside the worker (models are
+    loaded per process). Backtests only read the DataFrame passed in, so no
+    data fetcher or exchange connection is sent across processes.
+    """
+    risk_manager = RiskManager(config.get('risk', {}))
+    strategy = HybridAIStrategy(config, None, risk_manager)
+    backtester = Backtester(strategy, initial_balance)
+    return backtester.run_backtest(df, symbol)
+
+
+def run_portfolio_backtest(dfs: Dict[str, pd.DataFrame], config: Dict,
+                           pairs: Optional[List[str]] = None,
+                           initial_balance: float = 100000000,
+                           max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Run backtests for several symbols in parallel, one process per symbol
+
+    Args:
+        dfs: Historical OHLCV data per symbol
+        config: Configuration dictionary used to build the strategy
+        pairs: Symbols to backtest (default: config pairs, else all of dfs)
+        initial_balance: Initial balance in IRT for each symbol
+        max_workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Dictionary mapping symbol to its backtest results
+    """
+    pairs = [symbol for symbol in (pairs or config.get('pairs') or list(dfs)) if symbol in dfs]
+    if not pairs:
+        logger.warning(" No data available for portfolio backtest")
+        return {}
+
+    # Not worth spawning processes for a single symbol
+    if len(pairs) == 1:
+        symbol = pairs[0]
+        return {symbol: _backtest_worker(symbol, dfs[symbol], config, initial_balance)}
+
+    max_workers = min(len(pairs), max_workers or os.cpu_count() or 1)
+    logger.info(f" Running portfolio backtest on {len(pairs)} symbols with {max_workers} workers")
+
+    results: Dict[str, Dict] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_backtest_worker, symbol, dfs[symbol], config, initial_balance): symbol
+            for symbol in pairs
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                logger.error(f" Backtest worker failed for {symbol}: {e}")
+
+    return {symbol: results[symbol] for symbol in pairs if symbol in results}
@@ -95,12 +95,7 @@ class RiskManager:
         Returns:
             Stop loss price
         """
-        if side == 'buy':
-            stop_loss_price = entry_price * (1 - self.stop_loss)
-        else:  # sell
-            stop_loss_price = entry_price * (1 + self.stop_loss)
-        
-        return stop_loss_price
+        return entry_price * (1 - self._side_sign(side) * self.stop_loss)
     
     def calculate_take_profit_price(self, entry_price: float, side: str) -> float:
         """
@@ -113,14 +108,10 @@ class RiskManager:
         Returns:
             Take profit price
         """
-        if side == 'buy':
-            take_profit_price = entry_price * (1 + self.take_profit)
-        else:  # sell
-            take_profit_price = entry_price * (1 - self.take_profit)
-        
-        return take_profit_price
+        return entry_price * (1 + self._side_sign(side) * self.take_profit)
     
-    def check_stop_loss(self, entry_price: float, current_price: float, side: str) -> bool:
+    def check_stop_loss(self, entry_price: float, current_price: float, side: str,
+                        stop_loss_price: Optional[float] = None) -> bool:
         """
         Check if stop loss should be triggered
         
@@ -128,23 +119,23 @@ class RiskManager:
             entry_price: Entry price
             current_price: Current market price
             side: 'buy' or 'sell'
+            stop_loss_price: Stop loss price fixed when the position was opened
+                (computed from entry_price if omitted)
             
         Returns:
             True if stop loss triggered
         """
-        stop_loss_price = self.calculate_stop_loss_price(entry_price, side)
-        
-        if side == 'buy':
-            triggered = current_price <= stop_loss_price
-        else:  # sell
-            triggered = current_price >= stop_loss_price
+        if stop_loss_price is None:
+            stop_loss_price = self.calculate_stop_loss_price(entry_price, side)
+        triggered = self._side_sign(side) * (current_price - stop_loss_price) <= 0
         
         if triggered:
             logger.warning(f" Stop loss triggered! Entry: {entry_price}, Current: {current_price}, SL: {stop_loss_price}")
         
         return triggered
     
-    def check_take_profit(self, entry_price: float, current_price: float, side: str) -> bool:
+    def check_take_profit(self, entry_price: float, current_price: float, side: str,
+                          take_profit_price: Optional[float] = None) -> bool:
         """
         Check if take profit should be triggered
         
@@ -152,21 +143,25 @@ class RiskManager:
             entry_price: Entry price
             current_price: Current market price
             side: 'buy' or 'sell'
+            take_profit_price: Take profit price fixed when the position was opened
+                (computed from entry_price if omitted)
             
         Returns:
             True if take profit triggered
         """
-        take_profit_price = self.calculate_take_profit_price(entry_price, side)
-        
-        if side == 'buy':
-            triggered = current_price >= take_profit_price
-        else:  # sell
-            triggered = current_price <= take_profit_price
+        if take_profit_price is None:
+            take_profit_price = self.calculate_take_profit_price(entry_price, side)
+        triggered = self._side_sign(side) * (current_price - take_profit_price) >= 0
         
         if triggered:
             logger.info(f" Take profit triggered! Entry: {entry_price}, Current: {current_price}, TP: {take_profit_price}")
         
         return triggered
+    
+    @staticmethod
+    def _side_sign(side: str) -> int:
+        """Direction of a position: +1 for 'buy' (long), -1 for 'sell' (short)"""
+        return 1 if side == 'buy' else -1
 
 
 
@@ -2,7 +2,13 @@
 Trading Strategy Engine - Hybrid AI Strategy
 """
 
-from typing import Dict, Optional
+import hashlib
+import json
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
 from core.data_fetcher import DataFetcher
 from core.ai_model import AIModel
 from core.prophet_model import ProphetForecaster
@@ -12,6 +18,17 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Integer action codes used by the vectorized backtest path
+HOLD, BUY, SELL = 0, 1, 2
+ACTIONS = ('hold', 'buy', 'sell')
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# Max number of signals kept by the per-bar signal cache
+SIGNAL_CACHE_SIZE = 4096
+
+# Max number of symbols whose trained models are kept loaded
+MODEL_CACHE_SIZE = 8
+
 
 class HybridAIStrategy:
     """Hybrid AI trading strategy combining ML, LSTM, Prophet, and technical indicators"""
@@ -28,26 +45,60 @@ class HybridAIStrategy:
         self.config = config
         self.data_fetcher = data_fetcher
         self.risk_manager = risk_manager
-        self.ai_model = AIModel(config.get('ai', {}))
-        self.prophet_model = ProphetForecaster(config.get('prophet', {}))
         self.indicators = TechnicalIndicators()
         self.confidence_threshold = config.get('ai', {}).get('confidence_threshold', 0.7)
+        self._signal_cache: OrderedDict = OrderedDict()
+        self._models: OrderedDict = OrderedDict()  # symbol -> (AIModel, ProphetForecaster)
+        # The dashboard shares one strategy across sessions; guards both caches
+        self._cache_lock = threading.Lock()
         logger.info(" Hybrid AI Strategy initialized")
     
-    def generate_signal(self, symbol: str) -> Dict:
+    @property
+    def config(self) -> Dict:
+        """Strategy settings (assign a new dict to change them, so the signal cache key follows)"""
+        return self._config
+    
+    @config.setter
+    def config(self, config: Dict) -> None:
+        self._config = config
+        self._config_hash = hashlib.sha256(
+            json.dumps(config, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    
+    def generate_signal(self, symbol: str, window: int = 200, timeframe: str = "1h") -> Dict:
         """
         Generate trading signal using all AI models and indicators
         
         Args:
             symbol: Trading pair symbol
+            window: Number of most recent bars the signal is computed on
+            timeframe: Candle timeframe of the market data
             
         Returns:
             Dictionary with action, confidence, and reasoning
         """
-        try:
-            # Fetch market data
-            df = self.data_fetcher.get_market_data(symbol, include_indicators=True)
+        # Fetch market data
+        df = self.data_fetcher.get_market_data(symbol, timeframe=timeframe, include_indicators=True)
+        return self.generate_signal_from_df(df, symbol, window)
+    
+    def generate_signal_from_df(self, df: Optional[pd.DataFrame], symbol: str, window: int = 200) -> Dict:
+        """
+        Generate trading signal for the last bar of a DataFrame
+        
+        Only the last `window` bars are used, as a fixed-size view, so the
+        cost per call does not grow with the length of the history passed in.
+        Signals are cached per (symbol, last bar, config), so evaluating the
+        same bar again with the same settings returns the cached signal.
+        
+        Args:
+            df: OHLCV data (indicators are calculated if missing)
+            symbol: Trading pair symbol (used to load trained models)
+            window: Number of most recent bars the signal is computed on
             
+        Returns:
+            Dictionary with action, confidence, and reasoning
+        """
+        try:
             if df is None or df.empty:
                 return {
                     'action': 'hold',
@@ -55,6 +106,19 @@ class HybridAIStrategy:
                     'reason': 'No market data available'
                 }
             
+            df = df.iloc[-window:]
+            
+            # Reuse the signal if this bar was already evaluated with the same settings
+            cache_key = self._signal_cache_key(df, symbol)
+            with self._cache_lock:
+                cached = self._signal_cache.get(cache_key)
+                if cached is not None:
+                    self._signal_cache.move_to_end(cache_key)
+                    return dict(cached)
+            
+            if 'rsi' not in df.columns:
+                df = self.indicators.calculate_all(df)
+            
             signals = []
             confidences = []
             reasons = []
@@ -65,14 +129,13 @@ class HybridAIStrategy:
             confidences.append(indicator_signal.get('confidence', 0.0))
             reasons.append(f"Technical indicators: {indicator_signal.get('action', 'hold')}")
             
+            # Use the trained models of this symbol (loaded once per symbol)
+            ai_model, prophet_model = self._ensure_models(symbol)
+            
             # 2. ML Models Prediction
             if self.config.get('ai', {}).get('enabled', True):
                 try:
-                    # Try to load models if not loaded
-                    if self.ai_model.rf_model is None:
-                        self.ai_model.load_models(symbol)
-                    
-                    ml_prediction = self.ai_model.predict_ml(df)
+                    ml_prediction = ai_model.predict_ml(df)
                     if ml_prediction['confidence'] > 0:
                         signals.append(ml_prediction['action'])
                         confidences.append(ml_prediction['confidence'])
@@ -80,7 +143,7 @@ class HybridAIStrategy:
                     
                     # LSTM Prediction
                     if 'lstm' in self.config.get('ai', {}).get('models', []):
-                        lstm_prediction = self.ai_model.predict_lstm(df)
+                        lstm_prediction = ai_model.predict_lstm(df)
                         if lstm_prediction['confidence'] > 0:
                             signals.append(lstm_prediction['action'])
                             confidences.append(lstm_prediction['confidence'])
@@ -91,12 +154,8 @@ class HybridAIStrategy:
             # 3. Prophet Forecasting
             if self.config.get('prophet', {}).get('enabled', True):
                 try:
-                    # Try to load Prophet model
-                    if self.prophet_model.model is None:
-                        self.prophet_model.load_model(symbol)
-                    
-                    if self.prophet_model.model is not None:
-                        prophet_forecast = self.prophet_model.forecast()
+                    if prophet_model.model is not None:
+                        prophet_forecast = prophet_model.forecast()
                         prophet_action = prophet_forecast.get('direction', 'hold')
                         
                         if prophet_action == 'up':
@@ -119,54 +178,22 @@ class HybridAIStrategy:
                     'reason': 'No signals generated'
                 }
             
-            # Count votes
-            buy_votes = signals.count('buy')
-            sell_votes = signals.count('sell')
-            hold_votes = signals.count('hold')
-            total_votes = len(signals)
-            
-            # Calculate weighted confidence
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            signal = self._aggregate_signals(signals, confidences, reasons)
             
-            # Determine action based on consensus
-            if buy_votes > sell_votes and buy_votes > hold_votes:
-                action = 'buy'
-                signal_strength = buy_votes / total_votes
-            elif sell_votes > buy_votes and sell_votes > hold_votes:
-                action = 'sell'
-                signal_strength = sell_votes / total_votes
-            else:
-                action = 'hold'
-                signal_strength = 0.0
+            logger.info(f" Signal generated for {symbol}: {signal['action']} (confidence: {signal['confidence']:.2f})")
             
-            # Final confidence = weighted average * signal strength
-            final_confidence = avg_confidence * signal_strength
-            
-            # Check if confidence meets threshold
-            if final_confidence < self.confidence_threshold:
-                action = 'hold'
-                reasons.append(f"Confidence {final_confidence:.2f} below threshold {self.confidence_threshold}")
-            
-            reason = " | ".join(reasons)
+            signal['details'] = {
+                'technical': indicator_signal,
+                'ml': ml_prediction if 'ml_prediction' in locals() else {},
+                'prophet': prophet_forecast if 'prophet_forecast' in locals() else {}
+            }
             
-            logger.info(f" Signal generated for {symbol}: {action} (confidence: {final_confidence:.2f})")
+            with self._cache_lock:
+                self._signal_cache[cache_key] = signal
+                if len(self._signal_cache) > SIGNAL_CACHE_SIZE:
+                    self._signal_cache.popitem(last=False)
             
-            return {
-                'action': action,
-                'confidence': float(final_confidence),
-                'reason': reason,
-                'signals': {
-                    'buy': buy_votes,
-                    'sell': sell_votes,
-                    'hold': hold_votes,
-                    'total': total_votes
-                },
-                'details': {
-                    'technical': indicator_signal,
-                    'ml': ml_prediction if 'ml_prediction' in locals() else {},
-                    'prophet': prophet_forecast if 'prophet_forecast' in locals() else {}
-                }
-            }
+            return dict(signal)
             
         except Exception as e:
             logger.error(f" Error generating signal: {e}")
@@ -176,6 +203,234 @@ class HybridAIStrategy:
                 'reason': f'Error: {str(e)}'
             }
     
+    def _ensure_models(self, symbol: str) -> Tuple[AIModel, ProphetForecaster]:
+        """
+        Get the trained models of a symbol
+        
+        Models are read from disk the first time a symbol is seen and kept in
+        a small LRU cache, so switching symbols does not reload them and each
+        symbol predicts with its own models. They are returned rather than
+        stored on the instance, so concurrent callers on different symbols
+        never see each other's models.
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Tuple of (AIModel, ProphetForecaster) for the symbol
+        """
+        with self._cache_lock:
+            models = self._models.get(symbol)
+            if models is not None:
+                self._models.move_to_end(symbol)
+                return models
+        
+        # Load outside the lock; if two callers race, both load and the last one is kept
+        ai_model = AIModel(self.config.get('ai', {}))
+        prophet_model = ProphetForecaster(self.config.get('prophet', {}))
+        if self.config.get('ai', {}).get('enabled', True):
+            ai_model.load_models(symbol)
+        if self.config.get('prophet', {}).get('enabled', True):
+            prophet_model.load_model(symbol)
+        
+        with self._cache_lock:
+            self._models[symbol] = (ai_model, prophet_model)
+            if len(self._models) > MODEL_CACHE_SIZE:
+                self._models.popitem(last=False)
+        return ai_model, prophet_model
+    
+    def clear_model_cache(self) -> None:
+        """Forget loaded models so they are read from disk again (e.g. after retraining)"""
+        with self._cache_lock:
+            self._models.clear()
+            self._signal_cache.clear()
+        logger.info(" Model cache cleared")
+    
+    def _signal_cache_key(self, df: pd.DataFrame, symbol: str) -> Hashable:
+        """
+        Cache key identifying a signal: symbol, last bar and strategy settings
+        
+        The last close is part of the key because the latest candle keeps
+        updating until it closes, and the config hash invalidates cached
+        signals whenever the settings change. The hash is computed when the
+        config is assigned, not per call.
+        """
+        latest = df.iloc[-1]
+        return (symbol, df.index[-1], float(latest['close']), float(latest.get('volume', 0.0)),
+                len(df), self._config_hash)
+    
+    def clear_signal_cache(self) -> None:
+        """Clear cached signals"""
+        with self._cache_lock:
+            self._signal_cache.clear()
+        logger.info(" Signal cache cleared")
+    
+    def _aggregate_signals(self, signals: List[str], confidences: List[float],
+                           reasons: List[str]) -> Dict:
+        """
+        Combine model votes into a single signal
+        
+        Args:
+            signals: Action voted by each model ('buy', 'sell' or 'hold')
+            confidences: Confidence reported by each model
+            reasons: Human readable reason per model
+            
+        Returns:
+            Dictionary with action, confidence, reason and vote counts
+        """
+        # Count votes in a single pass, indexed by action code
+        votes = [0, 0, 0]
+        for action in signals:
+            code = ACTION_CODES.get(action)
+            if code is not None:
+                votes[code] += 1
+        hold_votes, buy_votes, sell_votes = votes
+        total_votes = len(signals)
+        
+        # Calculate weighted confidence
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        
+        # Determine action based on consensus
+        if buy_votes > sell_votes and buy_votes > hold_votes:
+            action = 'buy'
+            signal_strength = buy_votes / total_votes
+        elif sell_votes > buy_votes and sell_votes > hold_votes:
+            action = 'sell'
+            signal_strength = sell_votes / total_votes
+        else:
+            action = 'hold'
+            signal_strength = 0.0
+        
+        # Final confidence = weighted average * signal strength
+        final_confidence = avg_confidence * signal_strength
+        
+        # Check if confidence meets threshold
+        if final_confidence < self.confidence_threshold:
+            action = 'hold'
+            reasons.append(f"Confidence {final_confidence:.2f} below threshold {self.confidence_threshold}")
+        
+        return {
+            'action': action,
+            'confidence': float(final_confidence),
+            'reason': " | ".join(reasons),
+            'signals': {
+                'buy': buy_votes,
+                'sell': sell_votes,
+                'hold': hold_votes,
+                'total': total_votes
+            }
+        }
+    
+    def precompute_features(self, df: pd.DataFrame, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Precompute every model's per-bar vote over a historical DataFrame
+        
+        Indicators and model predictions are computed once over the full
+        frame, so a backtest can look up the signal for bar i in O(1)
+        instead of re-running generate_signal on a growing prefix.
+        
+        Args:
+            df: Historical OHLCV data (indicators are added if missing)
+            symbol: Trading pair symbol (used to load trained models)
+            
+        Returns:
+            Dictionary of arrays aligned with df rows, consumed by
+            generate_signal_arrays. 'valid' marks the bars where all
+            technical indicators are defined
+        """
+        if 'rsi' not in df.columns:
+            df = self.indicators.calculate_all(df)
+        
+        n = len(df)
+        ai_config = self.config.get('ai', {})
+        
+        # 1. Technical Indicators
+        buy_score, sell_score = self.indicators.get_signal_scores(df)
+        features = {
+            'tech_action': np.where(buy_score > 0.6, BUY, np.where(sell_score > 0.6, SELL, HOLD)).astype(np.int8),
+            'tech_conf': np.maximum(buy_score, sell_score),
+            'ml_action': np.full(n, HOLD, dtype=np.int8),
+            'ml_conf': np.zeros(n),
+            'lstm_action': np.full(n, HOLD, dtype=np.int8),
+            'lstm_conf': np.zeros(n),
+            'prophet_action': np.full(n, HOLD, dtype=np.int8),
+            'prophet_conf': np.zeros(n),
+            'prophet_enabled': np.zeros(n, dtype=bool),
+            'valid': self._valid_bars(df)
+        }
+        
+        ai_model, prophet_model = self._ensure_models(symbol)
+        
+        # 2. ML Models Prediction
+        if ai_config.get('enabled', True):
+            ml_score, features['ml_conf'] = ai_model.predict_ml_batch(df)
+            features['ml_action'] = self._score_to_action(ml_score)
+            
+            if 'lstm' in ai_config.get('models', []):
+                lstm_score, features['lstm_conf'] = ai_model.predict_lstm_batch(df)
+                features['lstm_action'] = self._score_to_action(lstm_score)
+        
+        # 3. Prophet Forecasting (does not depend on the bar, forecast once)
+        if self.config.get('prophet', {}).get('enabled', True):
+            if prophet_model.model is not None:
+                prophet_forecast = prophet_model.forecast()
+                direction = prophet_forecast.get('direction', 'hold')
+                features['prophet_action'][:] = BUY if direction == 'up' else SELL if direction == 'down' else HOLD
+                features['prophet_conf'][:] = prophet_forecast.get('confidence', 0.0)
+                features['prophet_enabled'][:] = True
+        
+        return features
+    
+    def generate_signal_arrays(self, features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the trading signal for every bar at once
+        
+        Same voting rules as _aggregate_signals, evaluated over whole
+        arrays so the backtest loop only reads action codes and confidences.
+        
+        Args:
+            features: Output of precompute_features
+        
+        Returns:
+            Tuple of (action code, confidence) arrays, one entry per bar
+        """
+        n = len(features['tech_action'])
+        votes = [
+            (features['tech_action'], features['tech_conf'], np.ones(n, dtype=bool)),
+            (features['ml_action'], features['ml_conf'], features['ml_conf'] > 0),
+            (features['lstm_action'], features['lstm_conf'], features['lstm_conf'] > 0),
+            (features['prophet_action'], features['prophet_conf'], features['prophet_enabled'])
+        ]
+        
+        buy_votes = sum((action == BUY) & voted for action, _, voted in votes)
+        sell_votes = sum((action == SELL) & voted for action, _, voted in votes)
+        total_votes = sum(voted.astype(int) for _, _, voted in votes)
+        hold_votes = total_votes - buy_votes - sell_votes
+        avg_confidence = sum(np.where(voted, conf, 0.0) for _, conf, voted in votes) / total_votes
+        
+        is_buy = (buy_votes > sell_votes) & (buy_votes > hold_votes)
+        is_sell = (sell_votes > buy_votes) & (sell_votes > hold_votes)
+        signal_strength = np.where(is_buy, buy_votes, np.where(is_sell, sell_votes, 0)) / total_votes
+        
+        confidence = avg_confidence * signal_strength
+        actions = np.where(is_buy, BUY, np.where(is_sell, SELL, HOLD)).astype(np.int8)
+        actions[confidence < self.confidence_threshold] = HOLD
+        
+        return actions, confidence
+    
+    @staticmethod
+    def _valid_bars(df: pd.DataFrame) -> np.ndarray:
+        """Mask of bars where every indicator used by the technical vote is defined"""
+        columns = ['rsi', 'macd', 'macd_signal', 'ema_9', 'ema_21', 'close', 'bb_low', 'bb_high']
+        if not all(col in df.columns for col in columns):
+            return np.zeros(len(df), dtype=bool)
+        return df[columns].notna().all(axis=1).to_numpy()
+    
+    @staticmethod
+    def _score_to_action(scores: np.ndarray) -> np.ndarray:
+        """Map model scores to action codes (above 0.5 buy, below 0.5 sell)"""
+        return np.where(scores > 0.5, BUY, np.where(scores < 0.5, SELL, HOLD)).astype(np.int8)
+    
     def should_execute_trade(self, signal: Dict, symbol: str) -> bool:
         """
         Determine if trade should be executed based on signal and risk management
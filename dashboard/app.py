@@ -4,27 +4,32 @@ Pishgoo Dashboard - Streamlit Web Interface
 
 import streamlit as st
 import pandas as pd
+import hashlib
+import json
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.settings import load_config
+from config.settings import load_config, USER_CONFIG_PATH
 from core.exchange_manager import ExchangeManager
 from core.data_fetcher import DataFetcher
-from core.strategy import HybridAIStrategy
 from core.risk_manager import RiskManager
-from core.backtester import Backtester
-from core.prophet_model import ProphetForecaster
-from dashboard.components.charts import plot_price_chart, plot_prophet_forecast, plot_equity_curve, plot_indicators
 from dashboard.components.trading_panel import display_signal, display_balance, display_open_positions, display_open_orders
 from dashboard.components.settings_panel import render_settings
 from utils.logger import setup_logger
 from utils.translations import get_translation, set_language
-from train_models import train_models_for_symbol
+
+# Heavy modules (ML models, Prophet, Plotly) are imported lazily by the pages that use them
+if TYPE_CHECKING:
+    from core.strategy import HybridAIStrategy
+    from core.prophet_model import ProphetForecaster
 
 logger = setup_logger(__name__)
 
@@ -44,84 +49,120 @@ st.markdown("""
 .main-header{font-size:3rem;font-weight:bold;text-align:center;color:#1f77b4;padding:1rem}
 *{font-family:Vazirmatn,-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif!important}
 [data-testid="stSidebar"] *:not(script):not(style){font-family:Vazirmatn,-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif!important}
-/* Hide keyboard_double_arr text anywhere */
-*:contains("keyboard_double_arr"), *:contains("keyb") {
-    display: none !important;
-    visibility: hidden !important;
-    opacity: 0 !important;
-    font-size: 0 !important;
-    line-height: 0 !important;
-    height: 0 !important;
-    width: 0 !important;
-    overflow: hidden !important;
-}
 /* Target Material Icons that might render as text */
 .material-icons, [class*="material"], [class*="icon"] {
     font-family: 'Material Icons' !important;
 }
+/* Material icon ligatures (e.g. keyboard_double_arrow_left on the sidebar toggle)
+   render as raw text when the Vazirmatn override above wins, so keep their icon font */
+[data-testid="stIconMaterial"], [data-testid="stSidebar"] [data-testid="stIconMaterial"] {
+    font-family: 'Material Symbols Rounded' !important;
+}
 </style>
-<script>
-(function() {
-    function hideKeyboardText() {
-        // Find and hide all elements containing keyboard_double_arr
-        const allElements = document.querySelectorAll('*');
-        allElements.forEach(el => {
-            if (el.children.length === 0) {
-                const text = el.textContent || el.innerText || '';
-                if (text.includes('keyboard_double_arr') || text.includes('keyb') && text.length < 20) {
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                    el.style.opacity = '0';
-                    el.style.fontSize = '0';
-                    el.style.height = '0';
-                    el.style.width = '0';
-                    el.style.overflow = 'hidden';
-                    el.textContent = '';
-                    el.innerHTML = '';
-                }
-            }
-        });
-        
-        // Also check text nodes directly
-        const walker = document.createTreeWalker(
-            document.body,
-            NodeFilter.SHOW_TEXT,
-            null,
-            false
-        );
-        let node;
-        while (node = walker.nextNode()) {
-            const text = node.textContent.trim();
-            if (text === 'keyboard_double_arr' || (text.includes('keyb') && text.length < 20)) {
-                node.textContent = '';
-                if (node.parentElement) {
-                    node.parentElement.style.display = 'none';
-                }
-            }
-        }
-    }
+""", unsafe_allow_html=True)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_config_cached(config_mtime: int):
+    """Parsed configuration, held once per process for a given file version"""
+    return load_config()
+
+
+def get_config():
+    """Load configuration, re-reading the file only when it changed on disk"""
+    config_mtime = USER_CONFIG_PATH.stat().st_mtime_ns if USER_CONFIG_PATH.exists() else 0
+    return _load_config_cached(config_mtime)
+
+
+@st.cache_resource(show_spinner=False)
+def _io_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for exchange calls that can run alongside page rendering"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="pishgoo-io")
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _get_exchange_manager(exchange: str, api_key: str, api_secret: str) -> ExchangeManager:
+    """
+    Exchange client (and its HTTP connection pool) per exchange and credentials
     
-    // Run immediately
-    hideKeyboardText();
+    Kept separate from the other components so saving unrelated settings
+    doesn't tear down the exchange session.
+    """
+    return ExchangeManager({'exchange': exchange, 'api_key': api_key, 'api_secret': api_secret})
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _get_components(config_hash: str, _config: dict):
+    """Exchange, data, risk and strategy components, built once per config version"""
+    from core.strategy import HybridAIStrategy
     
-    // Run on DOM ready
-    if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', hideKeyboardText);
-    }
+    exchange_manager = _get_exchange_manager(
+        _config.get('exchange', 'nobitex'),
+        _config.get('api_key', ''),
+        _config.get('api_secret', '')
+    )
+    data_fetcher = DataFetcher(exchange_manager)
+    risk_manager = RiskManager(_config.get('risk', {}))
+    strategy = HybridAIStrategy(_config, data_fetcher, risk_manager)
+    return exchange_manager, data_fetcher, risk_manager, strategy
+
+
+def _config_hash(config: dict) -> str:
+    """Stable hash of the configuration, used as a cache key"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_components(config: dict):
+    """Get the shared components for the current configuration"""
+    return _get_components(_config_hash(config), config)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_market_data(exchange: str, symbol: str, timeframe: str, limit: int, include_indicators: bool,
+                       _data_fetcher: DataFetcher):
+    """
+    Market data per (exchange, symbol, timeframe, limit), kept for 30 seconds across reruns
     
-    // Run periodically to catch dynamically added content
-    setInterval(hideKeyboardText, 200);
+    Candles only depend on the exchange, not on the rest of the config, so
+    saving unrelated settings doesn't refetch them. Each call gets its own
+    copy of the cached DataFrame.
+    """
+    return _data_fetcher.get_market_data(symbol, timeframe, limit, include_indicators)
+
+
+def fetch_market_data(config: dict, data_fetcher: DataFetcher, symbol: str, limit: int,
+                      include_indicators: bool = True, timeframe: str = "1h"):
+    """Get market data without hitting the exchange on every rerun"""
+    return _fetch_market_data(config.get('exchange', 'nobitex').lower(), symbol, timeframe, limit,
+                              include_indicators, data_fetcher)
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_signal(config_hash: str, pair: str, bar_ts: int, _strategy: 'HybridAIStrategy',
+                   _df: pd.DataFrame) -> dict:
+    """Trading signal per (config, pair, last bar), kept for 15 seconds across reruns"""
+    return _strategy.generate_signal_from_df(_df, pair)
+
+
+def get_signal(config: dict, strategy: 'HybridAIStrategy', pair: str, df: pd.DataFrame) -> dict:
+    """Get the trading signal for the last bar of df, reusing it until a new bar arrives"""
+    return _cached_signal(_config_hash(config), pair, int(df.index[-1].value), strategy, df)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_prophet(pair: str, config_hash: str, _prophet_config: dict) -> 'ProphetForecaster':
+    """Prophet forecaster with the saved model of a pair, loaded once per process"""
+    from core.prophet_model import ProphetForecaster
     
-    // Also use MutationObserver to catch new elements
-    const observer = new MutationObserver(hideKeyboardText);
-    observer.observe(document.body, {
-        childList: true,
-        subtree: true,
-        characterData: true
-    });
-})();
-</script>
-""", unsafe_allow_html=True)
+    prophet = ProphetForecaster(_prophet_config)
+    prophet.load_model(pair)
+    return prophet
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_forecast(pair: str, config_hash: str, bar_ts: int, _prophet: 'ProphetForecaster') -> dict:
+    """Prophet forecast per (pair, config, last bar), kept for 5 minutes"""
+    return _prophet.forecast()
+
 
 # Session state
 if 'authenticated' not in st.session_state:
@@ -132,36 +173,81 @@ if 'trading_enabled' not in st.session_state:
 
 # Initialize language
 if 'language' not in st.session_state:
-    config = load_config()
+    config = get_config()
     st.session_state.language = config.get('dashboard', {}).get('language', 'en') if config else 'en'
 
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a table before it is sent to the browser
+    
+    Repeated strings become categoricals (dictionary encoded by Arrow) and
+    float columns are downcast to float32 where that keeps their values.
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include=['object', 'string']):
+        df[col] = df[col].astype('category')
+    for col in df.select_dtypes(include='float64'):
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+
 # Helper function to get translations
+@lru_cache(maxsize=4096)
+def _tr(lang: str, key: str) -> str:
+    """Memoized translation lookup per (language, key)"""
+    return get_translation(key, lang)
+
+
 def t(key: str) -> str:
     """Get translated text"""
-    return get_translation(key, st.session_state.language)
+    return _tr(st.session_state.language, key)
+
+
+# Right-to-left layout for Persian
+RTL_CSS = '<style>.stApp{direction:rtl}.stMarkdown,.stText,.element-container{text-align:right}</style>'
+
+
+# Navigation pages as (translation key, page name)
+PAGES = (
+    ('dashboard', "Dashboard"),
+    ('trading', "Trading"),
+    ('backtest', "Backtest"),
+    ('train_models', "Train Models"),
+    ('settings', "Settings")
+)
+
+
+@lru_cache(maxsize=8)
+def _page_options(lang: str):
+    """Translated navigation labels and the label -> page name map for a language"""
+    labels = tuple(_tr(lang, key) for key, _ in PAGES)
+    return labels, {label: page for label, (_, page) in zip(labels, PAGES)}
 
 
 def login_page():
     """Login page"""
     # Language selection on login page
-    config = load_config()
+    config = get_config()
     current_lang = config.get('dashboard', {}).get('language', 'en') if config else 'en'
     
     col1, col2 = st.columns([3, 1])
     with col2:
         lang_choice = st.selectbox(
-            get_translation('select_language', current_lang),
+            _tr(current_lang, 'select_language'),
             ['en', 'fa'],
-            format_func=lambda x: get_translation('english', current_lang) if x == 'en' else get_translation('persian', current_lang),
+            format_func=lambda x: _tr(current_lang, 'english') if x == 'en' else _tr(current_lang, 'persian'),
             index=0 if current_lang == 'en' else 1
         )
         if lang_choice != current_lang:
             from config.settings import update_config
             update_config({'dashboard': {'language': lang_choice}})
             st.session_state.language = lang_choice
+            _tr.cache_clear()
+            _page_options.cache_clear()
+            _load_config_cached.clear()
             st.rerun()
     
-    st.title(get_translation('login_title', st.session_state.language))
+    st.title(t('login_title'))
     st.markdown("---")
     
     default_password = config.get('dashboard', {}).get('password', 'pishgoo123')
@@ -179,24 +265,16 @@ def login_page():
 def main_dashboard():
     """Main dashboard"""
     # Set direction based on language
+    # Streamlit drops elements a rerun does not emit again, so this can't be injected once per session
     lang = st.session_state.get('language', 'en')
     if lang == 'fa':
-        st.markdown("""
-        <style>
-        .stApp {
-            direction: rtl;
-        }
-        .stMarkdown, .stText, .element-container {
-            text-align: right;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(RTL_CSS, unsafe_allow_html=True)
     
     # Header
     st.markdown(f'<p class="main-header">{t("app_title")}</p>', unsafe_allow_html=True)
     
     # Load configuration
-    config = load_config()
+    config = get_config()
     if not config:
         st.error("Failed to load configuration")
         return
@@ -216,26 +294,17 @@ def main_dashboard():
             from config.settings import update_config
             update_config({'dashboard': {'language': lang_choice}})
             st.session_state.language = lang_choice
+            _tr.cache_clear()
+            _page_options.cache_clear()
+            _load_config_cached.clear()
             st.rerun()
         
         st.markdown("---")
         
-        page = st.selectbox(t('navigation'), [
-            t('dashboard'),
-            t('trading'),
-            t('backtest'),
-            t('train_models'),
-            t('settings')
-        ])
+        page_options, page_map = _page_options(st.session_state.language)
+        page = st.selectbox(t('navigation'), page_options)
         
         # Map translated page names to actual page names
-        page_map = {
-            t('dashboard'): "Dashboard",
-            t('trading'): "Trading",
-            t('backtest'): "Backtest",
-            t('train_models'): "Train Models",
-            t('settings'): "Settings"
-        }
         page = page_map.get(page, "Dashboard")
         
         if st.button(t('logout')):
@@ -255,12 +324,9 @@ def main_dashboard():
         else:
             st.info(t('trading_paused'))
     
-    # Initialize components
+    # Initialize components (cached across reruns until the config changes)
     try:
-        exchange_manager = ExchangeManager(config)
-        data_fetcher = DataFetcher(exchange_manager)
-        risk_manager = RiskManager(config.get('risk', {}))
-        strategy = HybridAIStrategy(config, data_fetcher, risk_manager)
+        exchange_manager, data_fetcher, risk_manager, strategy = get_components(config)
     except Exception as e:
         st.error(f" Error initializing components: {e}")
         st.stop()
@@ -269,7 +335,7 @@ def main_dashboard():
     if page == "Dashboard":
         render_dashboard(config, data_fetcher, strategy, exchange_manager)
     elif page == "Trading":
-        render_trading(config, strategy, exchange_manager)
+        render_trading(config, strategy, exchange_manager, data_fetcher)
     elif page == "Backtest":
         render_backtest(config, strategy, data_fetcher)
     elif page == "Train Models":
@@ -279,23 +345,31 @@ def main_dashboard():
         st.stop()
 
 
-def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: HybridAIStrategy, 
+def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: 'HybridAIStrategy', 
                     exchange_manager: ExchangeManager):
     """Render main dashboard"""
+    from dashboard.components.charts import plot_price_chart, plot_prophet_forecast, plot_indicators
+    
     pairs = config.get('pairs', ['BTCIRT'])
     selected_pair = st.selectbox(t('select_pair'), pairs)
     
+    # The balance doesn't depend on anything below, so request it while the page renders
+    balance_future = _io_pool().submit(exchange_manager.get_balance)
+    
     # Refresh button
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button(t('refresh')):
+            exchange_manager.clear_cache()
             data_fetcher.clear_cache()
+            _fetch_market_data.clear()
+            _cached_signal.clear()
             st.rerun()
     
     # Get market data
     with st.spinner(t('loading_market_data')):
         try:
-            df = data_fetcher.get_market_data(selected_pair, limit=200)
+            df = fetch_market_data(config, data_fetcher, selected_pair, limit=200)
             
             if df is None or df.empty:
                 st.error(t('no_market_data'))
@@ -307,8 +381,10 @@ def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: HybridAI
             return
         
         # Current price
-        current_price = df.iloc[-1]['close']
-        price_change = ((current_price - df.iloc[-2]['close']) / df.iloc[-2]['close']) * 100 if len(df) > 1 else 0
+        closes = df['close'].to_numpy()
+        current_price = closes[-1]
+        prev_price = closes[-2] if closes.size > 1 else current_price
+        price_change = ((current_price - prev_price) / prev_price) * 100 if closes.size > 1 else 0.0
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -316,18 +392,18 @@ def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: HybridAI
         
         # Indicators
         if 'rsi' in df.columns:
-            rsi = df.iloc[-1]['rsi']
+            rsi = df['rsi'].iat[-1]
             with col2:
                 st.metric("RSI", f"{rsi:.2f}")
         
         if 'macd' in df.columns:
-            macd = df.iloc[-1]['macd']
+            macd = df['macd'].iat[-1]
             with col3:
                 st.metric("MACD", f"{macd:.2f}")
         
         # Generate signal
         with st.spinner("Generating trading signal..."):
-            signal = strategy.generate_signal(selected_pair)
+            signal = get_signal(config, strategy, selected_pair, df)
             with col4:
                 st.metric(t('trading_signal'), signal['action'].upper(), f"{signal['confidence']:.2%}")
         
@@ -343,12 +419,11 @@ def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: HybridAI
             st.subheader("� Prophet Forecast")
             with st.spinner("Generating Prophet forecast..."):
                 try:
-                    prophet = ProphetForecaster(config.get('prophet', {}))
-                    if prophet.model is None:
-                        prophet.load_model(selected_pair)
+                    config_hash = _config_hash(config)
+                    prophet = _get_prophet(selected_pair, config_hash, config.get('prophet', {}))
                     
                     if prophet.model is not None:
-                        forecast = prophet.forecast()
+                        forecast = _get_forecast(selected_pair, config_hash, int(df.index[-1].value), prophet)
                         if not forecast['forecast_df'].empty:
                             plot_prophet_forecast(forecast['forecast_df'], df.tail(100))
                             
@@ -368,14 +443,15 @@ def render_dashboard(config: dict, data_fetcher: DataFetcher, strategy: HybridAI
         
         # Balance
         try:
-            balance = exchange_manager.get_balance()
+            balance = balance_future.result()
             if balance:
                 display_balance(balance)
         except Exception as e:
             st.warning(f"Balance not available: {e}")
 
 
-def render_trading(config: dict, strategy: HybridAIStrategy, exchange_manager: ExchangeManager):
+def render_trading(config: dict, strategy: 'HybridAIStrategy', exchange_manager: ExchangeManager,
+                   data_fetcher: DataFetcher):
     """Render trading page"""
     st.subheader(t('trading'))
     
@@ -386,9 +462,11 @@ def render_trading(config: dict, strategy: HybridAIStrategy, exchange_manager: E
     if st.button(t('generate_signal')):
         with st.spinner("Generating signal..."):
             try:
-                data_fetcher = DataFetcher(exchange_manager)
-                strategy.data_fetcher = data_fetcher
-                signal = strategy.generate_signal(selected_pair)
+                df = fetch_market_data(config, data_fetcher, selected_pair, limit=200)
+                if df is None or df.empty:
+                    signal = strategy.generate_signal_from_df(df, selected_pair)
+                else:
+                    signal = get_signal(config, strategy, selected_pair, df)
                 display_signal(signal)
                 
                 # Manual trade execution
@@ -423,8 +501,11 @@ def render_trading(config: dict, strategy: HybridAIStrategy, exchange_manager: E
         st.warning(f"Could not fetch open orders: {e}")
 
 
-def render_backtest(config: dict, strategy: HybridAIStrategy, data_fetcher: DataFetcher):
+def render_backtest(config: dict, strategy: 'HybridAIStrategy', data_fetcher: DataFetcher):
     """Render backtest page"""
+    from core.backtester import Backtester
+    from dashboard.components.charts import plot_equity_curve
+    
     st.subheader(t('backtesting'))
     
     pairs = config.get('pairs', ['BTCIRT'])
@@ -438,14 +519,13 @@ def render_backtest(config: dict, strategy: HybridAIStrategy, data_fetcher: Data
         with st.spinner("Running backtest..."):
             try:
                 # Get historical data
-                df = data_fetcher.get_market_data(selected_pair, limit=500)
+                df = fetch_market_data(config, data_fetcher, selected_pair, limit=500)
                 
                 if df is None or df.empty:
                     st.error("No data available for backtest")
                     return
                 
                 # Run backtest
-                risk_manager = RiskManager(config.get('risk', {}))
                 backtester = Backtester(strategy, initial_balance)
                 results = backtester.run_backtest(df, selected_pair)
                 
@@ -476,10 +556,9 @@ def render_backtest(config: dict, strategy: HybridAIStrategy, data_fetcher: Data
                 plot_equity_curve(results['equity_curve'])
                 
                 # Trade list
-                if results['trades']:
+                if not results['trades'].empty:
                     st.subheader("� Trade History")
-                    trades_df = pd.DataFrame(results['trades'])
-                    st.dataframe(trades_df, use_container_width=True)
+                    st.dataframe(_compact_frame(results['trades']), use_container_width=True)
                 
             except Exception as e:
                 st.error(f" Backtest error: {e}")
@@ -499,57 +578,52 @@ def render_train_models(config: dict, data_fetcher: DataFetcher):
         status_text = st.empty()
         
         try:
+            from train_models import train_models_parallel
+            
             total_pairs = len(pairs)
-            results = {}
+            done = 0
+            last_ui = time.monotonic()
+            status_text.text(f"{t('training_started')} {', '.join(pairs)}...")
             
-            for idx, symbol in enumerate(pairs):
-                status_text.text(f"{t('training_started')} {symbol}... ({idx+1}/{total_pairs})")
-                progress_bar.progress((idx) / total_pairs)
-                
-                try:
-                    # Fetch historical data
-                    status_text.text(f"{t('training_status')}: {t('training_ml_models')} {symbol}")
-                    df = data_fetcher.get_market_data(symbol, limit=500, include_indicators=True)
-                    
-                    if df is None or df.empty:
-                        results[symbol] = {'status': 'failed', 'message': t('no_data_available')}
-                        continue
-                    
-                    # Train ML models
-                    if config.get('ai', {}).get('enabled', True):
-                        from core.ai_model import AIModel
-                        ai_model = AIModel(config.get('ai', {}))
-                        
-                        status_text.text(f"{t('training_status')}: {t('training_ml_models')} {symbol}")
-                        ml_success = ai_model.train_ml_models(df, symbol)
-                        
-                        # Train LSTM if enabled
-                        if 'lstm' in config.get('ai', {}).get('models', []):
-                            status_text.text(f"{t('training_status')}: {t('training_lstm')} {symbol}")
-                            ai_model.train_lstm(df, symbol)
-                    
-                    # Train Prophet
-                    if config.get('prophet', {}).get('enabled', True):
-                        status_text.text(f"{t('training_status')}: {t('training_prophet')} {symbol}")
-                        from core.prophet_model import ProphetForecaster
-                        prophet = ProphetForecaster(config.get('prophet', {}))
-                        prophet.train(df, symbol)
-                    
-                    results[symbol] = {'status': 'success', 'message': t('models_trained')}
-                    
-                except Exception as e:
-                    results[symbol] = {'status': 'failed', 'message': str(e)}
-                
-                progress_bar.progress((idx + 1) / total_pairs)
+            def on_result(symbol: str, result: dict):
+                # Each UI update is a websocket round-trip, so sync at most every 250 ms (and on the last pair)
+                nonlocal done, last_ui
+                done += 1
+                now = time.monotonic()
+                if done == total_pairs or now - last_ui >= 0.25:
+                    status_text.text(f"{t('training_status')}: {symbol} ({done}/{total_pairs})")
+                    progress_bar.progress(done / total_pairs)
+                    last_ui = now
+            
+            # Data fetches run on threads and training in worker processes, overlapping across pairs
+            results = train_models_parallel(pairs, config, data_fetcher, on_result=on_result)
+            for result in results.values():
+                if result['status'] == 'success':
+                    result['message'] = t('models_trained')
+                elif result['status'] == 'no_data':
+                    result['message'] = t('no_data_available')
+            
+            if any(result['models'].get('prophet') for result in results.values()):
+                _get_prophet.clear()
+                _get_forecast.clear()
+            
+            # Rebuild the strategy on the next run so it loads the new models
+            _get_components.clear()
             
             # Display results
-            status_text.text(t('training_completed'))
-            st.success(t('training_completed'))
+            if all(result['status'] == 'success' for result in results.values()):
+                status_text.text(t('training_completed'))
+                st.success(t('training_completed'))
+            else:
+                status_text.text(t('training_incomplete'))
+                st.warning(t('training_incomplete'))
             
             st.subheader(t('training_status'))
             for symbol, result in results.items():
                 if result['status'] == 'success':
                     st.success(f"✓ {symbol}: {result['message']}")
+                elif result['status'] == 'partial':
+                    st.warning(f"! {symbol}: {result['message']}")
                 else:
                     st.error(f"✗ {symbol}: {result['message']}")
             
@@ -4,7 +4,8 @@ Chart components for Streamlit dashboard
 
 import streamlit as st
 import pandas as pd
-from typing import Dict, Optional
+import numpy as np
+from typing import Dict, Optional, Sequence
 
 # Optional import for plotly
 try:
@@ -14,6 +15,30 @@ except ImportError:
     PLOTLY_AVAILABLE = False
     go = None
 
+# Upper bound on points sent to the browser per trace
+MAX_CHART_POINTS = 500
+
+
+def _downsample(data, max_points: int = MAX_CHART_POINTS):
+    """
+    Keep every n-th row of a DataFrame, Series or array so at most max_points remain
+    
+    The stride is anchored on the last row, so the latest bar is always shown.
+    """
+    n = len(data)
+    if n <= max_points:
+        return data
+    step = -(-n // max_points)
+    rows = slice((n - 1) % step, None, step)
+    return data.iloc[rows] if isinstance(data, (pd.DataFrame, pd.Series)) else data[rows]
+
+
+def _date_axis(index: pd.Index):
+    """Datetime index as int64 epoch milliseconds, which Plotly reads on a date axis"""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    return index
+
 
 def plot_price_chart(df: pd.DataFrame, symbol: str, title: str = "Price Chart"):
     """Plot OHLCV price chart"""
@@ -26,55 +51,63 @@ def plot_price_chart(df: pd.DataFrame, symbol: str, title: str = "Price Chart"):
         st.warning("No data available for chart")
         return
     
-    fig = go.Figure()
+    df = _downsample(df)
+    cols = frozenset(df.columns)
+    
+    # Plain typed arrays: epoch milliseconds for the date axis, float64 prices
+    # (float32 only resolves IRT prices to hundreds of rials)
+    x = _date_axis(df.index)
+    
+    def values(col: str) -> np.ndarray:
+        return df[col].to_numpy(dtype=np.float64)
     
     # Candlestick chart
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
+    traces = [go.Candlestick(
+        x=x,
+        open=values('open'),
+        high=values('high'),
+        low=values('low'),
+        close=values('close'),
         name='Price'
-    ))
+    )]
     
     # Add EMAs if available
-    if 'ema_9' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['ema_9'],
+    if 'ema_9' in cols:
+        traces.append(go.Scatter(
+            x=x,
+            y=values('ema_9'),
             name='EMA 9',
             line=dict(color='blue', width=1)
         ))
     
-    if 'ema_21' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['ema_21'],
+    if 'ema_21' in cols:
+        traces.append(go.Scatter(
+            x=x,
+            y=values('ema_21'),
             name='EMA 21',
             line=dict(color='orange', width=1)
         ))
     
-    if 'ema_50' in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['ema_50'],
+    if 'ema_50' in cols:
+        traces.append(go.Scatter(
+            x=x,
+            y=values('ema_50'),
             name='EMA 50',
             line=dict(color='purple', width=1)
         ))
     
     # Bollinger Bands
-    if all(col in df.columns for col in ['bb_high', 'bb_low', 'bb_mid']):
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['bb_high'],
+    if {'bb_high', 'bb_low', 'bb_mid'}.issubset(cols):
+        traces.append(go.Scatter(
+            x=x,
+            y=values('bb_high'),
             name='BB High',
             line=dict(color='gray', width=1, dash='dash'),
             showlegend=False
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['bb_low'],
+        traces.append(go.Scatter(
+            x=x,
+            y=values('bb_low'),
             name='BB Low',
             line=dict(color='gray', width=1, dash='dash'),
             fill='tonexty',
@@ -82,14 +115,16 @@ def plot_price_chart(df: pd.DataFrame, symbol: str, title: str = "Price Chart"):
             showlegend=False
         ))
     
-    fig.update_layout(
+    # Build the figure in one pass
+    fig = go.Figure(data=traces, layout=go.Layout(
         title=title,
         xaxis_title="Time",
         yaxis_title="Price (IRT)",
         template="plotly_dark",
         height=500,
+        xaxis_type='date',
         xaxis_rangeslider_visible=False
-    )
+    ))
     
     st.plotly_chart(fig, use_container_width=True)
 
@@ -104,11 +139,15 @@ def plot_prophet_forecast(forecast_df: pd.DataFrame, historical_df: Optional[pd.
         st.warning("No forecast data available")
         return
     
-    fig = go.Figure()
+    forecast_df = _downsample(forecast_df)
+    if historical_df is not None:
+        historical_df = _downsample(historical_df)
+    
+    traces = []
     
     # Historical data
     if historical_df is not None and not historical_df.empty:
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             x=historical_df.index,
             y=historical_df['close'],
             name='Historical Price',
@@ -116,7 +155,7 @@ def plot_prophet_forecast(forecast_df: pd.DataFrame, historical_df: Optional[pd.
         ))
     
     # Forecast
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=forecast_df['ds'],
         y=forecast_df['yhat'],
         name='Forecast',
@@ -124,14 +163,14 @@ def plot_prophet_forecast(forecast_df: pd.DataFrame, historical_df: Optional[pd.
     ))
     
     # Confidence interval
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=forecast_df['ds'],
         y=forecast_df['yhat_upper'],
         name='Upper Bound',
         line=dict(color='gray', width=1, dash='dash'),
         showlegend=False
     ))
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=forecast_df['ds'],
         y=forecast_df['yhat_lower'],
         name='Lower Bound',
@@ -141,32 +180,38 @@ def plot_prophet_forecast(forecast_df: pd.DataFrame, historical_df: Optional[pd.
         showlegend=False
     ))
     
-    fig.update_layout(
+    fig = go.Figure(data=traces, layout=go.Layout(
         title="Prophet Forecast",
         xaxis_title="Time",
         yaxis_title="Price (IRT)",
         template="plotly_dark",
         height=400
-    )
+    ))
     
     st.plotly_chart(fig, use_container_width=True)
 
 
-def plot_equity_curve(equity_curve: list):
+def plot_equity_curve(equity_curve: Sequence[float]):
     """Plot equity curve from backtest"""
     if not PLOTLY_AVAILABLE:
         st.warning("Plotly is not available. Please install with: pip install plotly")
         st.line_chart(pd.DataFrame({'equity': equity_curve}))
         return
     
-    if not equity_curve or len(equity_curve) < 2:
+    if equity_curve is None or len(equity_curve) < 2:
         st.warning("No equity curve data available")
         return
     
+    # Typed arrays let Plotly encode both axes as binary buffers
+    y = np.asarray(equity_curve, dtype=np.float64)
+    x = _downsample(np.arange(y.size, dtype=np.int32))
+    y = _downsample(y)
+    
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        y=equity_curve,
+        x=x,
+        y=y,
         mode='lines',
         name='Equity',
         line=dict(color='green', width=2)
@@ -192,44 +237,46 @@ def plot_indicators(df: pd.DataFrame):
     if df.empty:
         return
     
+    df = _downsample(df)
+    cols = frozenset(df.columns)
+    
     # RSI
-    if 'rsi' in df.columns:
+    if 'rsi' in cols:
         st.subheader("RSI")
-        fig_rsi = go.Figure()
-        fig_rsi.add_trace(go.Scatter(
+        fig_rsi = go.Figure(data=[go.Scatter(
             x=df.index,
             y=df['rsi'],
             name='RSI',
             line=dict(color='purple', width=2)
-        ))
+        )], layout=go.Layout(template="plotly_dark", height=250))
         fig_rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought")
         fig_rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold")
-        fig_rsi.update_layout(template="plotly_dark", height=250)
         st.plotly_chart(fig_rsi, use_container_width=True)
     
     # MACD
-    if all(col in df.columns for col in ['macd', 'macd_signal']):
+    if {'macd', 'macd_signal'}.issubset(cols):
         st.subheader("MACD")
-        fig_macd = go.Figure()
-        fig_macd.add_trace(go.Scatter(
-            x=df.index,
-            y=df['macd'],
-            name='MACD',
-            line=dict(color='blue', width=2)
-        ))
-        fig_macd.add_trace(go.Scatter(
-            x=df.index,
-            y=df['macd_signal'],
-            name='Signal',
-            line=dict(color='orange', width=2)
-        ))
-        if 'macd_diff' in df.columns:
-            fig_macd.add_trace(go.Bar(
+        traces = [
+            go.Scatter(
+                x=df.index,
+                y=df['macd'],
+                name='MACD',
+                line=dict(color='blue', width=2)
+            ),
+            go.Scatter(
+                x=df.index,
+                y=df['macd_signal'],
+                name='Signal',
+                line=dict(color='orange', width=2)
+            )
+        ]
+        if 'macd_diff' in cols:
+            traces.append(go.Bar(
                 x=df.index,
                 y=df['macd_diff'],
                 name='Histogram',
                 marker_color='gray'
             ))
-        fig_macd.update_layout(template="plotly_dark", height=250)
+        fig_macd = go.Figure(data=traces, layout=go.Layout(template="plotly_dark", height=250))
         st.plotly_chart(fig_macd, use_container_width=True)
 
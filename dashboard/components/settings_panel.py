@@ -3,7 +3,7 @@ Settings panel components
 """
 
 import streamlit as st
-from config.settings import load_config, save_config
+from config.settings import load_config, save_config, USER_CONFIG_PATH
 from utils.translations import get_translation
 
 def t(key: str) -> str:
@@ -12,17 +12,91 @@ def t(key: str) -> str:
     return get_translation(key, lang)
 
 
-def render_settings():
-    """Render settings panel"""
-    config = load_config()
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_load_config(config_mtime: int):
+    """Parsed configuration for a given file version (each call gets its own copy)"""
+    return load_config()
+
+
+def _config_mtime() -> int:
+    """Modification time of the user config file (0 if it does not exist)"""
+    return USER_CONFIG_PATH.stat().st_mtime_ns if USER_CONFIG_PATH.exists() else 0
+
+
+# Config keys written by each settings section, and the message shown once it is saved
+_SECTIONS = {
+    'password': ([('dashboard', 'password')], 'password_saved'),
+    'exchange': ([('exchange',), ('api_key',), ('api_secret',)], 'exchange_saved'),
+    'pairs': ([('pairs',)], 'pairs_saved'),
+    'risk': ([('risk', 'stop_loss'), ('risk', 'take_profit'), ('risk', 'max_position_size')], 'risk_saved'),
+    'amount': ([('amount_per_trade',)], 'amount_saved'),
+    'ai': ([('ai', 'enabled'), ('ai', 'models'), ('ai', 'confidence_threshold')], 'ai_saved')
+}
+
+
+# Settings sections are fragments: interacting with one reruns only that section
+# (st.fragment since Streamlit 1.37, st.experimental_fragment before)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+
+def _dirty() -> set:
+    """Settings sections with staged, unsaved changes"""
+    if 'config_dirty' not in st.session_state:
+        st.session_state.config_dirty = set()
+    return st.session_state.config_dirty
+
+
+def _load_config():
+    """
+    Configuration held in the session across reruns
     
-    if not config:
-        st.error("Failed to load configuration")
-        return
+    Reloaded only when the file changed on disk (e.g. the language was
+    switched from the sidebar) and nothing is staged.
+    """
+    config_mtime = _config_mtime()
+    if not st.session_state.get('config') or (
+            not _dirty() and st.session_state.get('config_mtime') != config_mtime):
+        st.session_state.config = _cached_load_config(config_mtime)
+        st.session_state.config_mtime = config_mtime
+    return st.session_state.config
+
+
+def _stage(section: str):
+    """Mark a section's edits (already applied to the session config) for the next save"""
+    _dirty().add(section)
+    st.info(t('changes_staged'))
+
+
+def _save_staged() -> bool:
+    """
+    Write all staged sections to disk with a single save
     
-    st.subheader(t('settings'))
+    The staged keys are applied on top of the file as it is now, so settings
+    changed elsewhere since the session copy was loaded are kept.
+    """
+    staged = st.session_state.config
+    config = load_config() or {}
+    for section in _dirty():
+        for path in _SECTIONS[section][0]:
+            source, target = staged, config
+            for key in path[:-1]:
+                source = source[key]
+                target = target.setdefault(key, {})
+            target[path[-1]] = source[path[-1]]
     
-    # Password change section
+    if not save_config(config):
+        return False
+    
+    _cached_load_config.clear()
+    _dirty().clear()
+    st.session_state.config = config
+    st.session_state.config_mtime = _config_mtime()
+    return True
+
+
+@_fragment
+def _password_section(config: dict):
+    """Password change section"""
     with st.expander(t('change_password')):
         current_password = st.text_input(t('current_password'), type="password")
         new_password = st.text_input(t('new_password'), type="password")
@@ -30,7 +104,7 @@ def render_settings():
         
         if st.button(t('save_password')):
             # Validate current password
-            stored_password = config.get('dashboard', {}).get('password', 'pishgoo123')
+            stored_password = config['dashboard']['password']
             if current_password != stored_password:
                 st.error(t('wrong_current_password'))
             elif new_password != confirm_password:
@@ -39,29 +113,29 @@ def render_settings():
                 st.error(t('password_too_short'))
             else:
                 # Update password
-                if 'dashboard' not in config:
-                    config['dashboard'] = {}
                 config['dashboard']['password'] = new_password
-                save_config(config)
-                st.success(t('password_saved'))
-    
-    # Exchange settings
+                _stage('password')
+
+
+@_fragment
+def _exchange_section(config: dict):
+    """Exchange settings"""
     with st.expander(t('exchange_config')):
         exchange = st.selectbox(
             t('exchange'),
             ["nobitex", "wallex"],
-            index=0 if config.get('exchange', 'nobitex') == 'nobitex' else 1
+            index=0 if config['exchange'] == 'nobitex' else 1
         )
         
         api_key = st.text_input(
             t('api_key'),
-            value=config.get('api_key', ''),
+            value=config['api_key'],
             type="password"
         )
         
         api_secret = st.text_input(
             t('api_secret'),
-            value=config.get('api_secret', ''),
+            value=config['api_secret'],
             type="password"
         )
         
@@ -69,12 +143,14 @@ def render_settings():
             config['exchange'] = exchange
             config['api_key'] = api_key
             config['api_secret'] = api_secret
-            save_config(config)
-            st.success(t('exchange_saved'))
-    
-    # Trading pairs
+            _stage('exchange')
+
+
+@_fragment
+def _pairs_section(config: dict):
+    """Trading pairs"""
     with st.expander(t('trading_pairs')):
-        default_pairs = config.get('pairs', ['BTCIRT', 'ETHIRT'])
+        default_pairs = config['pairs']
         pairs_input = st.text_input(
             t('pairs_input'),
             value=", ".join(default_pairs)
@@ -83,26 +159,24 @@ def render_settings():
         if st.button(t('save_pairs')):
             pairs = [p.strip() for p in pairs_input.split(',')]
             config['pairs'] = pairs
-            save_config(config)
-            st.success(t('pairs_saved'))
-    
-    # Risk management
+            _stage('pairs')
+
+
+@_fragment
+def _risk_section(config: dict):
+    """Risk management"""
     with st.expander(t('risk_management')):
         # Convert decimal to percentage for display
-        stop_loss_decimal = config.get('risk', {}).get('stop_loss', 0.03)
-        stop_loss_percent = stop_loss_decimal * 100
-        
-        take_profit_decimal = config.get('risk', {}).get('take_profit', 0.05)
-        take_profit_percent = take_profit_decimal * 100
-        
-        max_position_decimal = config.get('risk', {}).get('max_position_size', 0.20)
-        max_position_percent = max_position_decimal * 100
+        risk = config['risk']
+        stop_loss_percent = int(risk['stop_loss'] * 100)
+        take_profit_percent = int(risk['take_profit'] * 100)
+        max_position_percent = int(risk['max_position_size'] * 100)
         
         stop_loss = st.slider(
             t('stop_loss'),
             min_value=0,
             max_value=100,
-            value=int(stop_loss_percent),
+            value=stop_loss_percent,
             step=1,
             format="%d%%"
         )
@@ -111,7 +185,7 @@ def render_settings():
             t('take_profit'),
             min_value=0,
             max_value=100,
-            value=int(take_profit_percent),
+            value=take_profit_percent,
             step=1,
             format="%d%%"
         )
@@ -120,63 +194,94 @@ def render_settings():
             t('max_position_size'),
             min_value=0,
             max_value=100,
-            value=int(max_position_percent),
+            value=max_position_percent,
             step=1,
             format="%d%%"
         )
         
         if st.button(t('save_risk')):
-            if 'risk' not in config:
-                config['risk'] = {}
             # Convert percentage back to decimal for storage
-            config['risk']['stop_loss'] = stop_loss / 100.0
-            config['risk']['take_profit'] = take_profit / 100.0
-            config['risk']['max_position_size'] = max_position / 100.0
-            save_config(config)
-            st.success(t('risk_saved'))
-    
-    # Trading amount
+            risk['stop_loss'] = stop_loss / 100.0
+            risk['take_profit'] = take_profit / 100.0
+            risk['max_position_size'] = max_position / 100.0
+            _stage('risk')
+
+
+@_fragment
+def _amount_section(config: dict):
+    """Trading amount"""
     with st.expander(t('trading_amount')):
         amount = st.number_input(
             t('amount_per_trade'),
             min_value=100000,
             max_value=1000000000,
-            value=config.get('amount_per_trade', 5000000),
+            value=config['amount_per_trade'],
             step=1000000
         )
         
         if st.button(t('save_amount')):
             config['amount_per_trade'] = amount
-            save_config(config)
-            st.success(t('amount_saved'))
-    
-    # AI settings
+            _stage('amount')
+
+
+@_fragment
+def _ai_section(config: dict):
+    """AI settings"""
     with st.expander(t('ai_settings')):
+        ai = config['ai']
         ai_enabled = st.checkbox(
             t('enable_ai'),
-            value=config.get('ai', {}).get('enabled', True)
+            value=ai['enabled']
         )
         
         models = st.multiselect(
             t('select_models'),
             ["ml", "lstm", "prophet"],
-            default=config.get('ai', {}).get('models', ['ml', 'lstm', 'prophet'])
+            default=ai['models']
         )
         
         confidence_threshold = st.slider(
             t('confidence_threshold'),
             min_value=0.0,
             max_value=1.0,
-            value=config.get('ai', {}).get('confidence_threshold', 0.7),
+            value=ai['confidence_threshold'],
             step=0.05
         )
         
         if st.button(t('save_ai')):
-            if 'ai' not in config:
-                config['ai'] = {}
-            config['ai']['enabled'] = ai_enabled
-            config['ai']['models'] = models
-            config['ai']['confidence_threshold'] = confidence_threshold
-            save_config(config)
-            st.success(t('ai_saved'))
+            ai['enabled'] = ai_enabled
+            ai['models'] = models
+            ai['confidence_threshold'] = confidence_threshold
+            _stage('ai')
+
+
+def render_settings():
+    """Render settings panel"""
+    config = _load_config()
+    
+    if not config:
+        st.error("Failed to load configuration")
+        return
+    
+    st.subheader(t('settings'))
+    
+    _password_section(config)
+    _exchange_section(config)
+    _pairs_section(config)
+    _risk_section(config)
+    _amount_section(config)
+    _ai_section(config)
+    
+    # Write everything staged above in one save. The button sits outside the
+    # section fragments, so clicking it reruns the page with the staged state
+    dirty = _dirty()
+    if dirty:
+        st.warning(t('unsaved_changes'))
+    if st.button(t('save_all')) and dirty:
+        saved_sections = [section for section in _SECTIONS if section in dirty]
+        if _save_staged():
+            for section in saved_sections:
+                st.success(t(_SECTIONS[section][1]))
+        else:
+            st.error(t('save_failed'))
 
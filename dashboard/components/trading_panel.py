@@ -2,9 +2,20 @@
 Trading panel components
 """
 
+import pandas as pd
 import streamlit as st
 from typing import Dict, Optional
 
+# Display style (color, emoji) per signal action
+_ACTION_STYLE = {
+    'buy': ('green', ''),
+    'sell': ('red', '')
+}
+_DEFAULT_STYLE = ('gray', '')
+
+# Columns shown in the open orders table
+_ORDER_COLUMNS = ['symbol', 'side', 'amount', 'price']
+
 
 def display_signal(signal: Dict):
     """Display trading signal"""
@@ -17,15 +28,7 @@ def display_signal(signal: Dict):
     reason = signal.get('reason', 'No reason provided')
     
     # Color based on action
-    if action == 'buy':
-        color = 'green'
-        emoji = ''
-    elif action == 'sell':
-        color = 'red'
-        emoji = ''
-    else:
-        color = 'gray'
-        emoji = ''
+    color, emoji = _ACTION_STYLE.get(action, _DEFAULT_STYLE)
     
     st.markdown(f"### Trading Signal: **{action.upper()}**")
     st.markdown(f"**Confidence:** {confidence:.2%}")
@@ -51,10 +54,9 @@ def display_balance(balance: Dict[str, float]):
     
     st.subheader("Account Balance")
     
-    cols = st.columns(min(4, len(balance)))
-    for idx, (currency, amount) in enumerate(balance.items()):
-        with cols[idx % 4]:
-            st.metric(currency, f"{amount:,.2f}")
+    # One table instead of a metric widget per currency
+    df = pd.DataFrame(sorted(balance.items()), columns=['currency', 'amount'])
+    st.dataframe(df.style.format({'amount': '{:,.2f}'}), use_container_width=True, hide_index=True)
 
 
 def display_open_positions(positions: list):
@@ -84,8 +86,9 @@ def display_open_orders(orders: list):
         st.info("No open orders")
         return
     
-    for order in orders:
-        st.write(f"- {order.get('symbol', 'N/A')} | {order.get('side', 'N/A')} | "
-                f"Amount: {order.get('amount', 0):,.4f} | "
-                f"Price: {order.get('price', 0):,.0f}")
+    df = pd.DataFrame(orders).reindex(columns=_ORDER_COLUMNS)
+    # Exchanges return amounts and prices as strings
+    df[['amount', 'price']] = df[['amount', 'price']].apply(pd.to_numeric, errors='coerce')
+    st.dataframe(df.style.format({'amount': '{:,.4f}', 'price': '{:,.0f}'}, na_rep='N/A'),
+                 use_container_width=True, hide_index=True)
 
@@ -3,8 +3,15 @@ Base exchange interface
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 import pandas as pd
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Upper bound on concurrent market data requests to one exchange
+MAX_FETCH_WORKERS = 8
 
 
 class BaseExchange(ABC):
@@ -46,6 +53,39 @@ class BaseExchange(ABC):
         """
         pass
     
+    def get_ohlcv_many(self, symbols: List[str], timeframe: str = "1h", limit: int = 100) -> Dict[str, pd.DataFrame]:
+        """
+        Get OHLCV data for several symbols concurrently
+        
+        The requests are network bound, so they are sent from a thread pool
+        (sharing the exchange's HTTP connection pool) and take about one
+        round trip instead of one per symbol.
+        
+        Args:
+            symbols: Trading pair symbols
+            timeframe: Timeframe (e.g., '1h', '4h', '1d')
+            limit: Number of candles to fetch per symbol
+            
+        Returns:
+            Dictionary mapping symbol to its OHLCV DataFrame (empty on failure)
+        """
+        if not symbols:
+            return {}
+        
+        def fetch(symbol: str) -> pd.DataFrame:
+            try:
+                return self.get_ohlcv(symbol, timeframe, limit)
+            except Exception as e:
+                logger.error(f" Error fetching OHLCV for {symbol}: {e}")
+                return pd.DataFrame()
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(symbols))) as executor:
+            return dict(zip(symbols, executor.map(fetch, symbols)))
+    
+    def clear_cache(self) -> None:
+        """Drop any cached market data (no-op for exchanges without a cache)"""
+        pass
+    
     @abstractmethod
     def place_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None) -> Dict[str, Any]:
         """
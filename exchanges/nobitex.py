@@ -3,24 +3,49 @@ Nobitex Exchange Integration
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import hashlib
 import hmac
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from exchanges.base import BaseExchange
 from utils.logger import setup_logger
-from utils.helpers import retry
+from utils.helpers import retry, TIMEFRAME_SECONDS
+
+# Optional import for orjson (faster parsing of the numeric OHLCV arrays)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = setup_logger(__name__)
 
+# Max number of public responses kept for ETag revalidation
+ETAG_CACHE_SIZE = 64
+
 
 class NobitexExchange(BaseExchange):
     """Nobitex exchange implementation"""
     
     BASE_URL = "https://api.nobitex.ir"
     
+    # UDF resolution and bar length in seconds per timeframe
+    _RESOLUTION_MAP = {
+        "1m": "1",
+        "5m": "5",
+        "15m": "15",
+        "30m": "30",
+        "1h": "60",
+        "4h": "240",
+        "1d": "D"
+    }
+    
     def __init__(self, api_key: str, api_secret: str):
         """
         Initialize Nobitex exchange
@@ -30,19 +55,78 @@ class NobitexExchange(BaseExchange):
             api_secret: Nobitex API secret
         """
         super().__init__(api_key, api_secret)
+        # One keep-alive connection pool for all (public and authenticated) calls;
+        # retries are handled by the @retry decorator
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self.session.mount("https://", adapter)
+        
+        # Keyed HMAC state, copied for each signature instead of re-keying. The API
+        # requires HMAC-SHA256; hashlib's sha256 is OpenSSL's (SHA-NI where available)
+        self._hmac_proto = hmac.new(self.api_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        
+        # (endpoint, params) -> (ETag, last built result) for conditional public GETs
+        self._etags: OrderedDict = OrderedDict()
+        self._etags_lock = threading.Lock()
         logger.info(" Nobitex exchange initialized")
     
-    def _generate_signature(self, data: Dict[str, Any]) -> str:
-        """Generate HMAC signature for API requests"""
-        sorted_data = sorted(data.items())
-        message = "&".join([f"{k}={v}" for k, v in sorted_data])
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+    @staticmethod
+    def _canonical(params: Dict[str, Any]) -> str:
+        """The sorted, '&'-separated "k=v" string that gets signed (values unescaped)"""
+        return "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    
+    def _generate_signature(self, canonical: str) -> str:
+        """Generate HMAC signature over the canonical params string"""
+        mac = self._hmac_proto.copy()
+        mac.update(canonical.encode('utf-8'))
+        return mac.hexdigest()
+    
+    @staticmethod
+    def _parse(response: requests.Response) -> Any:
+        """Decode a JSON response body, with orjson when available"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    def _conditional_get(self, endpoint: str, params: Optional[Dict[str, Any]],
+                         build: Callable[[Any], Any], key_params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a public endpoint, revalidating the last response with its ETag
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            build: Turns the parsed JSON body into the value to return (a DataFrame
+                or dict, empty when the API reports an error)
+            key_params: Params identifying the cached response (default: params)
+            
+        Returns:
+            Built value; on 304 Not Modified the cached one, without downloading,
+            parsing or rebuilding the body
+        """
+        key = (endpoint, frozenset((key_params if key_params is not None else params or {}).items()))
+        with self._etags_lock:
+            cached = self._etags.get(key)
+        
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = self.session.get(f"{self.BASE_URL}{endpoint}", params=params,
+                                    headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            with self._etags_lock:
+                self._etags.move_to_end(key)
+            return cached[1].copy()
+        
+        response.raise_for_status()
+        result = build(self._parse(response))
+        
+        etag = response.headers.get('ETag')
+        if etag and len(result):
+            with self._etags_lock:
+                self._etags[key] = (etag, result.copy())
+                self._etags.move_to_end(key)
+                if len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return result
     
     def _make_authenticated_request(self, endpoint: str, method: str = "POST", 
                                    params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -61,7 +145,7 @@ class NobitexExchange(BaseExchange):
         params['apiKey'] = self.api_key
         params['timestamp'] = str(int(time.time() * 1000))
         
-        signature = self._generate_signature(params)
+        signature = self._generate_signature(self._canonical(params))
         params['signature'] = signature
         
         url = f"{self.BASE_URL}{endpoint}"
@@ -73,7 +157,7 @@ class NobitexExchange(BaseExchange):
                 response = self.session.get(url, params=params, timeout=10)
             
             response.raise_for_status()
-            return response.json()
+            return self._parse(response)
         except Exception as e:
             logger.error(f" Nobitex API error: {e}")
             raise
@@ -81,23 +165,19 @@ class NobitexExchange(BaseExchange):
     @retry(max_attempts=3, delay=1.0)
     def get_balance(self) -> Dict[str, float]:
         """Get account balance"""
-        try:
-            endpoint = "/v2/wallets"
-            response = self._make_authenticated_request(endpoint, method="GET")
-            
-            if response.get('status') == 'ok':
-                wallets = response.get('wallets', {})
-                balances = {}
-                for currency, wallet_data in wallets.items():
-                    if isinstance(wallet_data, dict):
-                        balances[currency] = float(wallet_data.get('balance', 0))
-                logger.info(f" Balance fetched: {len(balances)} currencies")
-                return balances
-            else:
-                logger.error(f" Failed to fetch balance: {response}")
-                return {}
-        except Exception as e:
-            logger.error(f" Error getting balance: {e}")
+        endpoint = "/v2/wallets"
+        response = self._make_authenticated_request(endpoint, method="GET")
+        
+        if response.get('status') == 'ok':
+            wallets = response.get('wallets', {})
+            balances = {}
+            for currency, wallet_data in wallets.items():
+                if isinstance(wallet_data, dict):
+                    balances[currency] = float(wallet_data.get('balance', 0))
+            logger.info(f" Balance fetched: {len(balances)} currencies")
+            return balances
+        else:
+            logger.error(f" Failed to fetch balance: {response}")
             return {}
     
     @retry(max_attempts=3, delay=1.0)
@@ -110,53 +190,50 @@ class NobitexExchange(BaseExchange):
             timeframe: Timeframe (1h, 4h, 1d)
             limit: Number of candles
         """
-        try:
-            # Convert timeframe to resolution
-            resolution_map = {
-                "1m": "1",
-                "5m": "5",
-                "15m": "15",
-                "30m": "30",
-                "1h": "60",
-                "4h": "240",
-                "1d": "D"
-            }
-            resolution = resolution_map.get(timeframe, "60")
-            
-            # Nobitex market endpoint
-            endpoint = f"/market/udf/history"
-            params = {
-                "symbol": symbol.lower(),
-                "resolution": resolution,
-                "from": int(time.time()) - (limit * 3600),  # Approximate
-                "to": int(time.time()),
-                "countback": limit
-            }
-            
-            url = f"{self.BASE_URL}{endpoint}"
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('s') == 'ok' and 't' in data:
-                df = pd.DataFrame({
-                    'timestamp': pd.to_datetime(data['t'], unit='s'),
-                    'open': data['o'],
-                    'high': data['h'],
-                    'low': data['l'],
-                    'close': data['c'],
-                    'volume': data['v']
-                })
-                df.set_index('timestamp', inplace=True)
-                df = df.sort_index()
-                logger.info(f" Fetched {len(df)} candles for {symbol}")
-                return df
-            else:
-                logger.warning(f" No data returned for {symbol}")
-                return pd.DataFrame()
-        except Exception as e:
-            logger.error(f" Error fetching OHLCV for {symbol}: {e}")
+        # Convert timeframe to resolution
+        resolution = self._RESOLUTION_MAP.get(timeframe, "60")
+        lookback = limit * TIMEFRAME_SECONDS.get(timeframe, 3600)
+        
+        # Nobitex market endpoint
+        endpoint = f"/market/udf/history"
+        now = int(time.time())
+        params = {
+            "symbol": symbol.lower(),
+            "resolution": resolution,
+            "from": now - lookback,
+            "to": now,
+            "countback": limit
+        }
+        
+        # The time window moves every call, so revalidate on the rest of the params
+        key_params = {k: params[k] for k in ("symbol", "resolution", "countback")}
+        df = self._conditional_get(endpoint, params, self._ohlcv_frame, key_params)
+        
+        if not df.empty:
+            logger.info(f" Fetched {len(df)} candles for {symbol}")
+        else:
+            logger.warning(f" No data returned for {symbol}")
+        return df
+    
+    @staticmethod
+    def _ohlcv_frame(data: Dict[str, Any]) -> pd.DataFrame:
+        """Build the OHLCV DataFrame from a UDF history response"""
+        if data.get('s') != 'ok' or 't' not in data:
             return pd.DataFrame()
+        
+        # Copy each parsed array straight into one preallocated float64 block,
+        # laid out column by column as pandas stores it
+        values = np.empty((5, len(data['t'])), dtype=np.float64)
+        for row, key in enumerate(('o', 'h', 'l', 'c', 'v')):
+            values[row] = data[key]
+        timestamps = pd.to_datetime(np.asarray(data['t'], dtype=np.int64), unit='s')
+        df = pd.DataFrame(values.T, index=timestamps, columns=['open', 'high', 'low', 'close', 'volume'])
+        df.index.name = 'timestamp'
+        
+        # Candles come back in ascending order; only sort if they don't
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df
     
     @retry(max_attempts=3, delay=1.0)
     def place_order(self, symbol: str, side: str, amount: float, 
@@ -170,112 +247,97 @@ class NobitexExchange(BaseExchange):
             amount: Order amount
             price: Limit price (None for market order)
         """
-        try:
-            endpoint = "/v2/order"
-            params = {
-                "type": "limit" if price else "market",
-                "execution": "limit" if price else "market",
-                "srcCurrency": symbol.replace("IRT", "").replace("USDT", ""),
-                "dstCurrency": "IRT" if "IRT" in symbol else "USDT",
-                "amount": str(amount),
-                "price": str(price) if price else None
+        endpoint = "/v2/order"
+        params = {
+            "type": "limit" if price else "market",
+            "execution": "limit" if price else "market",
+            "srcCurrency": symbol.replace("IRT", "").replace("USDT", ""),
+            "dstCurrency": "IRT" if "IRT" in symbol else "USDT",
+            "amount": str(amount),
+            "price": str(price) if price else None
+        }
+        
+        # Remove None values
+        params = {k: v for k, v in params.items() if v is not None}
+        
+        if side == "sell":
+            # Swap currencies for sell
+            params['srcCurrency'], params['dstCurrency'] = \
+                params['dstCurrency'], params['srcCurrency']
+        
+        response = self._make_authenticated_request(endpoint, method="POST", params=params)
+        
+        if response.get('status') == 'ok':
+            order = response.get('order', {})
+            logger.info(f" Order placed: {side} {amount} {symbol} at {price or 'market'}")
+            return {
+                'id': order.get('id'),
+                'symbol': symbol,
+                'side': side,
+                'amount': amount,
+                'price': price,
+                'status': 'open',
+                'timestamp': time.time_ns()  # placement time, ns since the epoch
             }
-            
-            # Remove None values
-            params = {k: v for k, v in params.items() if v is not None}
-            
-            if side == "sell":
-                # Swap currencies for sell
-                params['srcCurrency'], params['dstCurrency'] = \
-                    params['dstCurrency'], params['srcCurrency']
-            
-            response = self._make_authenticated_request(endpoint, method="POST", params=params)
-            
-            if response.get('status') == 'ok':
-                order = response.get('order', {})
-                logger.info(f" Order placed: {side} {amount} {symbol} at {price or 'market'}")
-                return {
-                    'id': order.get('id'),
-                    'symbol': symbol,
-                    'side': side,
-                    'amount': amount,
-                    'price': price,
-                    'status': 'open',
-                    'timestamp': datetime.now().isoformat()
-                }
-            else:
-                error_msg = response.get('message', 'Unknown error')
-                logger.error(f" Order failed: {error_msg}")
-                raise Exception(f"Order failed: {error_msg}")
-        except Exception as e:
-            logger.error(f" Error placing order: {e}")
-            raise
+        else:
+            error_msg = response.get('message', 'Unknown error')
+            logger.error(f" Order failed: {error_msg}")
+            raise Exception(f"Order failed: {error_msg}")
     
     @retry(max_attempts=3, delay=1.0)
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order"""
-        try:
-            endpoint = "/v2/order"
-            params = {"id": order_id, "status": "cancelled"}
-            
-            response = self._make_authenticated_request(endpoint, method="POST", params=params)
-            
-            if response.get('status') == 'ok':
-                logger.info(f" Order {order_id} cancelled")
-                return True
-            else:
-                logger.error(f" Failed to cancel order: {response}")
-                return False
-        except Exception as e:
-            logger.error(f" Error cancelling order: {e}")
+        endpoint = "/v2/order"
+        params = {"id": order_id, "status": "cancelled"}
+        
+        response = self._make_authenticated_request(endpoint, method="POST", params=params)
+        
+        if response.get('status') == 'ok':
+            logger.info(f" Order {order_id} cancelled")
+            return True
+        else:
+            logger.error(f" Failed to cancel order: {response}")
             return False
     
     @retry(max_attempts=3, delay=1.0)
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get open orders"""
-        try:
-            endpoint = "/v2/orders"
-            params = {"status": "open"}
-            if symbol:
-                params['market'] = symbol.lower()
-            
-            response = self._make_authenticated_request(endpoint, method="GET", params=params)
-            
-            if response.get('status') == 'ok':
-                orders = response.get('orders', [])
-                logger.info(f" Found {len(orders)} open orders")
-                return orders
-            else:
-                return []
-        except Exception as e:
-            logger.error(f" Error getting open orders: {e}")
+        endpoint = "/v2/orders"
+        params = {"status": "open"}
+        if symbol:
+            params['market'] = symbol.lower()
+        
+        response = self._make_authenticated_request(endpoint, method="GET", params=params)
+        
+        if response.get('status') == 'ok':
+            orders = response.get('orders', [])
+            logger.info(f" Found {len(orders)} open orders")
+            return orders
+        else:
             return []
     
+    @staticmethod
+    def _ticker(symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the ticker dict from an orderbook response"""
+        if data.get('status') != 'ok':
+            return {}
+        
+        bids = data.get('bids', [])
+        asks = data.get('asks', [])
+        
+        return {
+            'symbol': symbol,
+            'bid': float(bids[0][0]) if bids else 0,
+            'ask': float(asks[0][0]) if asks else 0,
+            'last': float(bids[0][0]) if bids else 0,
+            'volume': float(data.get('volume', 0))
+        }
+    
     @retry(max_attempts=3, delay=1.0)
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """Get ticker information"""
-        try:
-            endpoint = f"/v2/orderbook/{symbol.lower()}"
-            response = requests.get(f"{self.BASE_URL}{endpoint}", timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') == 'ok':
-                bids = data.get('bids', [])
-                asks = data.get('asks', [])
-                
-                return {
-                    'symbol': symbol,
-                    'bid': float(bids[0][0]) if bids else 0,
-                    'ask': float(asks[0][0]) if asks else 0,
-                    'last': float(bids[0][0]) if bids else 0,
-                    'volume': float(data.get('volume', 0))
-                }
-            else:
-                return {}
-        except Exception as e:
-            logger.error(f" Error getting ticker: {e}")
-            return {}
+        endpoint = f"/v2/orderbook/{symbol.lower()}"
+        return self._conditional_get(endpoint, None, lambda data: self._ticker(symbol, data))
 
 
 
@@ -3,18 +3,45 @@ Wallex Exchange Integration
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import hashlib
 import hmac
+import threading
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 from exchanges.base import BaseExchange
 from utils.logger import setup_logger
-from utils.helpers import retry
+from utils.helpers import retry, TIMEFRAME_SECONDS
+
+# Optional import for orjson (faster parsing of the numeric OHLCV arrays)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = setup_logger(__name__)
 
+# Seconds a fetched quote is reused (OHLCV windows are reused until the next candle boundary)
+TICKER_TTL = 5
+
+
+@lru_cache(maxsize=64)
+def _query_template(keys: Tuple[str, ...]) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Format template and sorted key order for one params key shape
+    
+    Each endpoint sends the same keys on every call, so the sort and the
+    "k={}" pieces are built once per shape and reused by the signer.
+    """
+    ordered = tuple(sorted(keys))
+    template = "&".join(f"{k.replace('{', '{{').replace('}', '}}')}={{}}" for k in ordered)
+    return template, ordered
+
 
 class WallexExchange(BaseExchange):
     """Wallex exchange implementation"""
@@ -30,22 +57,60 @@ class WallexExchange(BaseExchange):
             api_secret: Wallex API secret
         """
         super().__init__(api_key, api_secret)
+        # One keep-alive connection pool for all (public and authenticated) calls;
+        # retries are handled by the @retry decorator
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "pishgoo/1.0"})
+        
+        # Keyed HMAC state, copied for each signature instead of re-keying. The API
+        # requires HMAC-SHA256; hashlib's sha256 is OpenSSL's (SHA-NI where available)
+        self._hmac_proto = hmac.new(self.api_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        
+        # Public responses by request key -> (expiry as time.time(), DataFrame or dict)
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
         logger.info(" Wallex exchange initialized")
     
-    def _generate_signature(self, method: str, path: str, params: Dict[str, Any] = None) -> str:
+    def _cache_get(self, key: tuple) -> Optional[Any]:
+        """Copy of a cached public response, or None if missing or expired"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1].copy()
+    
+    def _cache_put(self, key: tuple, value: Any, expires_at: float) -> None:
+        """Cache a public response until expires_at (a time.time() value)"""
+        with self._cache_lock:
+            self._cache[key] = (expires_at, value.copy())
+    
+    def clear_cache(self) -> None:
+        """Drop all cached public responses"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _generate_signature(self, method: str, path: str, params: Dict[str, Any] = None,
+                            timestamp: Optional[int] = None) -> str:
         """Generate HMAC signature for API requests"""
         params = params or {}
-        query_string = "&".join([f"{k}={v}" for k, v in sorted(params.items())])
+        template, ordered = _query_template(tuple(params))
+        query_string = template.format(*map(params.__getitem__, ordered))
+        if timestamp is None:
+            timestamp = int(time.time())
         
-        message = f"{method}\n{path}\n{query_string}\n{int(time.time())}"
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
+        message = f"{method}\n{path}\n{query_string}\n{timestamp}"
+        mac = self._hmac_proto.copy()
+        mac.update(message.encode('utf-8'))
+        return mac.hexdigest()
+    
+    @staticmethod
+    def _parse(response: requests.Response) -> Any:
+        """Decode a JSON response body, with orjson when available"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
     
     def _make_authenticated_request(self, endpoint: str, method: str = "GET",
                                    params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -60,7 +125,8 @@ class WallexExchange(BaseExchange):
         params = params or {}
         timestamp = int(time.time())
         
-        signature = self._generate_signature(method, endpoint, params)
+        # Sign with the same timestamp that is sent in the header
+        signature = self._generate_signature(method, endpoint, params, timestamp)
         
         headers = {
             "X-API-Key": self.api_key,
@@ -78,7 +144,7 @@ class WallexExchange(BaseExchange):
                 response = self.session.get(url, params=params, headers=headers, timeout=10)
             
             response.raise_for_status()
-            return response.json()
+            return self._parse(response)
         except Exception as e:
             logger.error(f" Wallex API error: {e}")
             raise
@@ -114,6 +180,11 @@ class WallexExchange(BaseExchange):
             timeframe: Timeframe (1h, 4h, 1d)
             limit: Number of candles
         """
+        cache_key = ("ohlcv", symbol, timeframe, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Convert timeframe to interval
             interval_map = {
@@ -126,27 +197,36 @@ class WallexExchange(BaseExchange):
                 "1d": "1D"
             }
             interval = interval_map.get(timeframe, "60")
+            bar = TIMEFRAME_SECONDS.get(timeframe, 3600)
             
             endpoint = "/v1/markets/candles"
+            now = int(time.time())
             params = {
                 "symbol": symbol.upper(),
                 "resolution": interval,
-                "from": int(time.time()) - (limit * 3600),
-                "to": int(time.time())
+                "from": now - (limit * bar),
+                "to": now
             }
             
-            response = requests.get(f"{self.BASE_URL}{endpoint}", params=params, timeout=10)
+            response = self.session.get(f"{self.BASE_URL}{endpoint}", params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = self._parse(response)
             
             if data.get('result') and 'candles' in data:
-                candles = data['candles']
-                df = pd.DataFrame(candles)
-                df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-                df.set_index('timestamp', inplace=True)
-                df = df.sort_index()
+                # Parse the [timestamp, open, high, low, close, volume] rows in one go, then
+                # copy the values into one block laid out column by column as pandas stores it
+                rows = np.asarray(data['candles'], dtype=np.float64)
+                values = np.ascontiguousarray(rows[:, 1:].T)
+                timestamps = pd.to_datetime(rows[:, 0].astype(np.int64), unit='s')
+                df = pd.DataFrame(values.T, index=timestamps, columns=['open', 'high', 'low', 'close', 'volume'])
+                df.index.name = 'timestamp'
+                
+                # Candles normally come back in ascending order; only sort if they don't
+                if not df.index.is_monotonic_increasing:
+                    df = df.sort_index()
                 logger.info(f" Fetched {len(df)} candles for {symbol}")
+                # Reuse the window until the current candle closes
+                self._cache_put(cache_key, df, (time.time() // bar + 1) * bar)
                 return df
             else:
                 logger.warning(f" No data returned for {symbol}")
@@ -192,7 +272,7 @@ class WallexExchange(BaseExchange):
                     'amount': amount,
                     'price': price,
                     'status': 'open',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': time.time_ns()  # placement time, ns since the epoch
                 }
             else:
                 error_msg = response.get('message', 'Unknown error')
@@ -244,21 +324,28 @@ class WallexExchange(BaseExchange):
     @retry(max_attempts=3, delay=1.0)
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """Get ticker information"""
+        cache_key = ("ticker", symbol)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             endpoint = f"/v1/markets/quotes/{symbol.upper()}"
-            response = requests.get(f"{self.BASE_URL}{endpoint}", timeout=10)
+            response = self.session.get(f"{self.BASE_URL}{endpoint}", timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = self._parse(response)
             
             if data.get('result'):
                 quote = data['result']
-                return {
+                ticker = {
                     'symbol': symbol,
                     'bid': float(quote.get('bid', 0)),
                     'ask': float(quote.get('ask', 0)),
                     'last': float(quote.get('lastPrice', 0)),
                     'volume': float(quote.get('volume24h', 0))
                 }
+                self._cache_put(cache_key, ticker, time.time() + TICKER_TTL)
+                return ticker
             else:
                 return {}
         except Exception as e:
@@ -3,9 +3,14 @@ Pishgoo Auto Trading Service
 Runs continuously and executes trades based on AI signals
 """
 
+import math
 import time
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -15,10 +20,21 @@ from core.exchange_manager import ExchangeManager
 from core.data_fetcher import DataFetcher
 from core.strategy import HybridAIStrategy
 from core.risk_manager import RiskManager
+from utils.helpers import TIMEFRAME_SECONDS
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Upper bound on trading pairs processed concurrently
+MAX_PAIR_WORKERS = 8
+
+# Seconds to wait after a candle boundary for the exchange to publish the new candle
+CANDLE_GRACE = 2
+
+# Seconds between checks within a candle: open orders / positions are monitored
+# and pairs that failed on the current candle are retried
+RETRY_INTERVAL = 60
+
 
 class TradingService:
     """Auto trading service"""
@@ -30,14 +46,25 @@ class TradingService:
             raise Exception("Failed to load configuration")
         
         self.exchange_manager = ExchangeManager(self.config)
-        self.data_fetcher = DataFetcher(self.exchange_manager)
+        self.data_fetcher = DataFetcher(self.exchange_manager, incremental_indicators=True)
         self.risk_manager = RiskManager(self.config.get('risk', {}))
         self.strategy = HybridAIStrategy(self.config, self.data_fetcher, self.risk_manager)
         
         self.running = False
         self.trading_enabled = self.config.get('trading', {}).get('enabled', False)
         self.pairs = self.config.get('pairs', [])
-        self.check_interval = 300  # 5 minutes
+        self.timeframe = self.config.get('trading', {}).get('timeframe', '1h')
+        self.check_interval = TIMEFRAME_SECONDS.get(self.timeframe, 3600)  # one candle
+        
+        # Timestamp of the last candle each pair was processed on
+        self._last_bar: Dict[str, pd.Timestamp] = {}
+        
+        # Pairs are processed concurrently, since each one mostly waits on the exchange.
+        # The strategy keeps per-symbol model state on the instance, so signals are
+        # generated one at a time, and balance check + order placement stay atomic
+        self._executor = ThreadPoolExecutor(max_workers=min(MAX_PAIR_WORKERS, max(1, len(self.pairs))))
+        self._strategy_lock = threading.Lock()
+        self._order_lock = threading.Lock()
         
         logger.info(" Trading service initialized")
         logger.info(f" Trading pairs: {self.pairs}")
@@ -55,25 +82,79 @@ class TradingService:
                     time.sleep(60)
                     continue
                 
-                # Check each trading pair
-                for symbol in self.pairs:
-                    try:
-                        self.process_pair(symbol)
-                    except Exception as e:
-                        logger.error(f" Error processing {symbol}: {e}")
+                # Fetch market data for all pairs in one concurrent batch; the
+                # per-pair signals below are then served from the data cache
+                data = self.data_fetcher.get_market_data_many(self.pairs, timeframe=self.timeframe)
+                
+                # Check all pairs concurrently: positions are monitored on every check,
+                # signals are only generated for pairs with a new candle
+                bars = [self._latest_bar(data.get(symbol)) for symbol in self.pairs]
+                new_bars = [self._has_new_bar(symbol, data.get(symbol)) for symbol in self.pairs]
+                list(self._executor.map(self._safe_process, self.pairs, bars, new_bars))
                 
-                # Sleep before next iteration
-                logger.info(f" Sleeping for {self.check_interval}s...")
-                time.sleep(self.check_interval)
+                # Sleep until the next candle closes, checking positions in between
+                sleep_for = min(self._seconds_to_next_candle(), RETRY_INTERVAL)
+                logger.info(f" Sleeping for {sleep_for:.0f}s...")
+                time.sleep(sleep_for)
                 
         except KeyboardInterrupt:
             logger.info(" Trading service stopped by user")
         except Exception as e:
             logger.error(f" Trading service error: {e}")
             raise
+        finally:
+            self._executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _latest_bar(df: Optional[pd.DataFrame]) -> Optional[pd.Timestamp]:
+        """Timestamp of the last candle in the data, None if there is no data"""
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+    
+    def _has_new_bar(self, symbol: str, df: Optional[pd.DataFrame]) -> bool:
+        """Whether a pair has a candle it was not processed on yet (True if data is missing)"""
+        last_bar = self._latest_bar(df)
+        if last_bar is not None and self._last_bar.get(symbol) == last_bar:
+            logger.debug(f" {symbol}: No new candle since the last check")
+            return False
+        return True
+    
+    def _seconds_to_next_candle(self) -> float:
+        """Seconds until the next candle boundary, plus the publish grace period"""
+        now = time.time()
+        next_close = math.ceil(now / self.check_interval) * self.check_interval
+        return max(1.0, next_close - now + CANDLE_GRACE)
+    
+    def _safe_process(self, symbol: str, bar: Optional[pd.Timestamp] = None, new_bar: bool = True) -> bool:
+        """
+        Process a trading pair, logging (not raising) any error
+        
+        A new candle is only recorded as processed when processing succeeds, so
+        a failed run is retried on the next check instead of waiting a full bar.
+        
+        Returns:
+            True if the pair was processed without error
+        """
+        try:
+            self.process_pair(symbol, new_bar)
+        except Exception as e:
+            logger.error(f" Error processing {symbol}: {e}")
+            return False
+        
+        if new_bar and bar is not None:
+            self._last_bar[symbol] = bar
+        return True
     
-    def process_pair(self, symbol: str):
-        """Process a trading pair"""
+    def process_pair(self, symbol: str, new_bar: bool = True):
+        """
+        Process a trading pair
+        
+        Args:
+            symbol: Trading pair symbol
+            new_bar: Whether the pair has a candle it was not processed on yet;
+                open orders are monitored either way, signals only on a new candle
+        """
         logger.info(f" Processing {symbol}...")
         
         # Check for open positions
@@ -83,20 +164,25 @@ class TradingService:
             self.monitor_positions(symbol)
             return
         
-        # Generate signal
-        signal = self.strategy.generate_signal(symbol)
-        
-        if signal['action'] == 'hold':
-            logger.debug(f" {symbol}: Hold signal (confidence: {signal['confidence']:.2f})")
+        if not new_bar:
             return
         
-        # Check if signal is strong enough
-        if not self.strategy.should_execute_trade(signal, symbol):
-            logger.debug(f" {symbol}: Signal confidence too low")
-            return
+        # Generate signal
+        with self._strategy_lock:
+            signal = self.strategy.generate_signal(symbol, timeframe=self.timeframe)
+            
+            if signal['action'] == 'hold':
+                logger.debug(f" {symbol}: Hold signal (confidence: {signal['confidence']:.2f})")
+                return
+            
+            # Check if signal is strong enough
+            if not self.strategy.should_execute_trade(signal, symbol):
+                logger.debug(f" {symbol}: Signal confidence too low")
+                return
         
         # Execute trade
-        self.execute_trade(symbol, signal)
+        with self._order_lock:
+            self.execute_trade(symbol, signal)
     
     def execute_trade(self, symbol: str, signal: dict):
         """Execute a trade based on signal"""
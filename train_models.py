@@ -3,8 +3,14 @@ Training script for AI models
 Use this script to train all AI models before using auto trading
 """
 
+import os
 import sys
+import time
+import multiprocessing as mp
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.settings import load_config
@@ -12,31 +18,125 @@ from core.exchange_manager import ExchangeManager
 from core.data_fetcher import DataFetcher
 from core.ai_model import AIModel
 from core.prophet_model import ProphetForecaster
+from utils.helpers import TIMEFRAME_SECONDS, limit_threads
 from utils.logger import setup_logger
 
+# Optional import for pyarrow (Parquet training data cache)
+try:
+    import pyarrow
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 logger = setup_logger(__name__)
 
+# Raw OHLCV history kept between training runs, topped up with new candles
+DATA_CACHE_DIR = Path(__file__).parent / "data" / "cache"
 
-def train_models_for_symbol(symbol: str, config: dict, data_fetcher: DataFetcher):
-    """Train all models for a symbol"""
-    logger.info(f" Starting model training for {symbol}...")
+# Concurrent market data requests during training
+FETCH_WORKERS = 4
+
+
+def _cache_path(exchange: str, symbol: str, timeframe: str) -> Path:
+    """Training data cache file for a symbol on an exchange, Parquet if available, else pickle"""
+    suffix = "parquet" if PARQUET_AVAILABLE else "pkl"
+    return DATA_CACHE_DIR / f"{exchange}_{symbol}_{timeframe}.{suffix}"
+
+
+def load_training_data(symbol: str, data_fetcher: DataFetcher, limit: int = 500,
+                       timeframe: str = "1h") -> Optional[pd.DataFrame]:
+    """
+    Get the training window for a symbol from the local cache, fetching only new candles
     
-    # Fetch historical data
-    logger.info(f" Fetching historical data for {symbol}...")
-    df = data_fetcher.get_market_data(symbol, limit=500, include_indicators=True)
+    The raw OHLCV candles are cached on disk per exchange (Parquet with zstd
+    when pyarrow is installed). Later runs only request the candles since
+    the last cached one, which is always refetched since it may have been
+    still forming when it was cached. Indicators are recomputed on the merged window, so the cache stays valid
+    when the indicator code changes.
+    
+    Args:
+        symbol: Trading pair symbol
+        data_fetcher: Data fetcher whose exchange manager supplies missing candles
+        limit: Number of candles in the training window
+        timeframe: Timeframe (1h, 4h, 1d)
+        
+    Returns:
+        DataFrame with OHLCV and indicators, or None if no data
+    """
+    # One file per exchange, so switching exchanges never mixes their candles
+    path = _cache_path(data_fetcher.exchange_manager.exchange_type, symbol, timeframe)
+    cached = None
+    if path.exists():
+        try:
+            cached = pd.read_parquet(path) if PARQUET_AVAILABLE else pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f" Ignoring unreadable training data cache {path}: {e}")
+    
+    # Candles since the last cached one, which is refetched since it may have been still forming
+    fetch_limit = limit
+    if cached is not None and not cached.empty:
+        elapsed = max(0.0, time.time() - cached.index[-1].timestamp())
+        fetch_limit = min(limit, int(elapsed // TIMEFRAME_SECONDS.get(timeframe, 3600)) + 1)
+    
+    # Straight from the exchange: the data fetcher's short-lived cache is not
+    # keyed by limit, so it could serve a top-up the full window or vice versa
+    try:
+        fresh = data_fetcher.exchange_manager.get_ohlcv(symbol, timeframe, fetch_limit)
+    except Exception as e:
+        if cached is None or cached.empty:
+            raise
+        logger.warning(f" Could not top up training data for {symbol}, using cached candles: {e}")
+        fresh = None
+    
+    df = cached
+    fetched = 0
+    if fresh is not None and not fresh.empty:
+        fetched = len(fresh)
+        fresh = fresh[['open', 'high', 'low', 'close', 'volume']]
+        if df is not None and not df.empty:
+            df = pd.concat([df, fresh])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        else:
+            df = fresh
+        df = df.iloc[-limit:]
+        
+        try:
+            DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            if PARQUET_AVAILABLE:
+                df.to_parquet(path, compression="zstd")
+            else:
+                df.to_pickle(path)
+        except Exception as e:
+            logger.warning(f" Could not write training data cache {path}: {e}")
     
     if df is None or df.empty:
-        logger.error(f" No data available for {symbol}")
-        return False
+        return None
     
-    logger.info(f" Fetched {len(df)} data points")
+    logger.info(f" Training data for {symbol}: {len(df)} candles ({fetched} fetched)")
+    return data_fetcher.indicators.calculate_all(df)
+
+
+def train_models_on_data(symbol: str, df: pd.DataFrame, config: dict) -> Dict[str, bool]:
+    """
+    Train all enabled models for a symbol on already fetched data
+    
+    Args:
+        symbol: Trading pair symbol
+        df: Historical OHLCV data with indicators
+        config: Configuration dictionary
+        
+    Returns:
+        Dictionary mapping each trained model ('ml', 'lstm', 'prophet') to its success
+    """
+    trained = {}
     
     # Train ML models
     if config.get('ai', {}).get('enabled', True):
         logger.info(" Training ML models (RandomForest & XGBoost)...")
         ai_model = AIModel(config.get('ai', {}))
         
-        if ai_model.train_ml_models(df, symbol):
+        trained['ml'] = ai_model.train_ml_models(df, symbol)
+        if trained['ml']:
             logger.info(" ML models trained successfully")
         else:
             logger.warning(" ML model training failed")
@@ -44,7 +144,8 @@ def train_models_for_symbol(symbol: str, config: dict, data_fetcher: DataFetcher
         # Train LSTM if enabled
         if 'lstm' in config.get('ai', {}).get('models', []):
             logger.info(" Training LSTM model...")
-            if ai_model.train_lstm(df, symbol):
+            trained['lstm'] = ai_model.train_lstm(df, symbol)
+            if trained['lstm']:
                 logger.info(" LSTM model trained successfully")
             else:
                 logger.warning(" LSTM model training failed")
@@ -54,15 +155,121 @@ def train_models_for_symbol(symbol: str, config: dict, data_fetcher: DataFetcher
         logger.info(" Training Prophet model...")
         prophet = ProphetForecaster(config.get('prophet', {}))
         
-        if prophet.train(df, symbol):
+        trained['prophet'] = prophet.train(df, symbol)
+        if trained['prophet']:
             logger.info(" Prophet model trained successfully")
         else:
             logger.warning(" Prophet model training failed")
     
+    return trained
+
+
+def train_models_for_symbol(symbol: str, config: dict, data_fetcher: DataFetcher):
+    """Train all models for a symbol"""
+    logger.info(f" Starting model training for {symbol}...")
+    
+    # Fetch historical data
+    logger.info(f" Fetching historical data for {symbol}...")
+    df = load_training_data(symbol, data_fetcher, limit=500)
+    
+    if df is None or df.empty:
+        logger.error(f" No data available for {symbol}")
+        return False
+    
+    logger.info(f" Fetched {len(df)} data points")
+    
+    models = train_models_on_data(symbol, df, config)
+    if not all(models.values()):
+        logger.error(f" Model training failed for {symbol}")
+        return False
+    
     logger.info(f" Model training completed for {symbol}")
     return True
 
 
+def train_models_parallel(pairs: List[str], config: dict, data_fetcher: DataFetcher,
+                          max_workers: Optional[int] = None,
+                          on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+    """
+    Train models for several symbols, overlapping data fetches with training
+    
+    Market data is fetched on a thread pool (network bound) and each frame is
+    handed to a training process (CPU bound) as soon as it arrives. Training
+    processes are spawned rather than forked so they don't inherit the
+    parent's TensorFlow / BLAS thread state, and each one's library thread
+    pools are capped to its share of the cores so the processes don't
+    oversubscribe them.
+    
+    Args:
+        pairs: Symbols to train
+        config: Configuration dictionary
+        data_fetcher: Data fetcher used for the historical data
+        max_workers: Number of training processes (default: CPU count)
+        on_result: Optional callback called with (symbol, result) as each symbol finishes
+        
+    Returns:
+        Dictionary mapping symbol to a result with 'status' ('success', 'partial'
+        when only some models trained, 'no_data' or 'failed'), 'message' and the
+        per-model success flags in 'models'
+    """
+    results: Dict[str, Dict] = {}
+    if not pairs:
+        return results
+    
+    def finish(symbol: str, result: Dict):
+        results[symbol] = result
+        if on_result is not None:
+            on_result(symbol, result)
+    
+    cpu_count = os.cpu_count() or 1
+    max_workers = min(len(pairs), max_workers or cpu_count)
+    with ThreadPoolExecutor(max_workers=min(len(pairs), FETCH_WORKERS)) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context('spawn'),
+                                initializer=limit_threads,
+                                initargs=(max(1, cpu_count // max_workers),)) as train_pool:
+        fetches = {
+            fetch_pool.submit(load_training_data, symbol, data_fetcher, limit=500): symbol
+            for symbol in pairs
+        }
+        trainings = {}
+        for future in as_completed(fetches):
+            symbol = fetches[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                logger.error(f" Error fetching data for {symbol}: {e}")
+                finish(symbol, {'status': 'failed', 'message': str(e), 'models': {}})
+                continue
+            
+            if df is None or df.empty:
+                logger.error(f" No data available for {symbol}")
+                finish(symbol, {'status': 'no_data', 'message': f"No data available for {symbol}", 'models': {}})
+                continue
+            
+            logger.info(f" Fetched {len(df)} data points for {symbol}, training...")
+            trainings[train_pool.submit(train_models_on_data, symbol, df, config)] = symbol
+        
+        for future in as_completed(trainings):
+            symbol = trainings[future]
+            try:
+                models = future.result()
+            except Exception as e:
+                logger.error(f" Error training models for {symbol}: {e}")
+                finish(symbol, {'status': 'failed', 'message': str(e), 'models': {}})
+                continue
+            
+            failed = [name for name, ok in models.items() if not ok]
+            if not failed:
+                finish(symbol, {'status': 'success', 'message': f"Models trained for {symbol}", 'models': models})
+            else:
+                status = 'failed' if len(failed) == len(models) else 'partial'
+                logger.error(f" Training failed for {symbol}: {', '.join(failed)}")
+                finish(symbol, {'status': status, 'message': f"Failed to train {', '.join(failed)} for {symbol}",
+                                'models': models})
+    
+    return {symbol: results[symbol] for symbol in pairs if symbol in results}
+
+
 def main():
     """Main training function"""
     logger.info(" Starting model training...")
@@ -86,12 +293,13 @@ def main():
     pairs = config.get('pairs', ['BTCIRT', 'ETHIRT'])
     logger.info(f" Training models for pairs: {pairs}")
     
-    # Train models for each pair
-    for symbol in pairs:
-        try:
-            train_models_for_symbol(symbol, config, data_fetcher)
-        except Exception as e:
-            logger.error(f" Error training models for {symbol}: {e}")
+    # Train models for all pairs, fetching and training in parallel
+    results = train_models_parallel(pairs, config, data_fetcher)
+    
+    failed = [symbol for symbol, result in results.items() if result['status'] != 'success']
+    if failed:
+        logger.warning(f" Training did not complete for: {', '.join(failed)}")
+        return
     
     logger.info(" All models trained successfully!")
     logger.info(" You can now use auto trading or run backtests")
@@ -0,0 +1,294 @@
+"""
+Compiled technical indicator kernel for TechnicalIndicators
+
+Every indicator added by calculate_all is computed in a single pass over the
+price arrays. The recurrences follow the definitions of the `ta` library
+(Wilder smoothing for RSI, ATR and ADX, adjust=False EMAs for MACD and the
+EMAs, population standard deviation for the Bollinger Bands), including its
+warm-up conventions: leading NaNs for most indicators, leading zeros for ATR
+and ADX. The kernel is declared with an explicit signature, so it is compiled
+on import (and loaded from the on-disk cache after the first run).
+
+The pass can be resumed: the recursive averages are kept in a small state
+array between calls, so appending bars only costs work for the new bars
+(IncrementalIndicators).
+"""
+
+import numpy as np
+from utils._njit import njit, NUMBA_AVAILABLE
+
+# Output rows of compute_indicators, in order
+INDICATOR_COLUMNS = (
+    'rsi', 'macd', 'macd_signal', 'macd_diff',
+    'ema_9', 'ema_21', 'ema_50', 'ema_200',
+    'sma_20', 'sma_50',
+    'bb_high', 'bb_low', 'bb_mid',
+    'atr', 'momentum', 'volume_sma', 'adx',
+    'stoch_k', 'stoch_d', 'williams_r'
+)
+
+# Slots of the state array carried between compute_indicators calls
+(
+    _E9, _E21, _E50, _E200, _E12, _E26, _SIGNAL,
+    _AVG_GAIN, _AVG_LOSS, _ATR,
+    _TR_SUM, _DM_POS, _DM_NEG, _DX_SUM, _ADX,
+    _CLOSE_SUM_50, _VOLUME_SUM_20
+) = range(17)
+STATE_SIZE = 17
+
+# Bars of history compute_indicators reads back from the newest bar (SMA 50)
+LOOKBACK = 50
+
+if NUMBA_AVAILABLE:
+    from numba import types
+
+    INDICATORS_SIGNATURE = types.void(
+        types.float64[::1], types.float64[::1], types.float64[::1], types.float64[::1],
+        types.float64[:, ::1], types.int64, types.int64, types.int64, types.float64[::1]
+    )
+else:
+    INDICATORS_SIGNATURE = None
+
+
+@njit(INDICATORS_SIGNATURE, cache=True)
+def compute_indicators(high, low, close, volume, out, start, stop, offset, state):
+    """
+    Compute all indicators in one pass over bars start to stop
+
+    A call with start == offset == 0 starts the series and resets state. To
+    resume, call again with the same state over the bars that follow; the
+    arrays must still hold the LOOKBACK bars before start (and their output
+    columns). If older bars were dropped from the front of the arrays, offset
+    is how many, so that warm-up periods are still counted from the first bar
+    of the series.
+
+    Args:
+        high: High price per bar
+        low: Low price per bar
+        close: Close price per bar
+        volume: Volume per bar
+        out: Preallocated (len(INDICATOR_COLUMNS), len(close)) array, filled in place
+        start: First bar to compute
+        stop: One past the last bar to compute
+        offset: Bars of the series before index 0 of the arrays
+        state: STATE_SIZE array of running averages, updated in place
+    """
+    out[:, start:stop] = np.nan
+
+    rsi = out[0]
+    macd = out[1]
+    macd_signal = out[2]
+    macd_diff = out[3]
+    ema_9 = out[4]
+    ema_21 = out[5]
+    ema_50 = out[6]
+    ema_200 = out[7]
+    sma_20 = out[8]
+    sma_50 = out[9]
+    bb_high = out[10]
+    bb_low = out[11]
+    bb_mid = out[12]
+    atr = out[13]
+    momentum = out[14]
+    volume_sma = out[15]
+    adx = out[16]
+    stoch_k = out[17]
+    stoch_d = out[18]
+    williams_r = out[19]
+
+    # ATR and ADX are zero, not NaN, until defined
+    atr[start:stop] = 0.0
+    adx[start:stop] = 0.0
+
+    # Window shared by RSI, ATR, ADX, the stochastic oscillator and Williams %R
+    w = 14
+
+    if stop <= start:
+        return
+
+    # EMAs are seeded with the first close; MACD signal with the first MACD value
+    if start + offset == 0:
+        state[:] = 0.0
+        state[_E9] = state[_E21] = state[_E50] = state[_E200] = close[0]
+        state[_E12] = state[_E26] = close[0]
+
+    e9 = state[_E9]
+    e21 = state[_E21]
+    e50 = state[_E50]
+    e200 = state[_E200]
+    e12 = state[_E12]
+    e26 = state[_E26]
+    signal = state[_SIGNAL]
+
+    # Wilder averages of gains / losses (RSI) and of the true range (ATR)
+    avg_gain = state[_AVG_GAIN]
+    avg_loss = state[_AVG_LOSS]
+    atr_value = state[_ATR]
+
+    # Wilder sums of true range and directional movement, and the ADX (ta's indexing)
+    tr_sum = state[_TR_SUM]
+    dm_pos = state[_DM_POS]
+    dm_neg = state[_DM_NEG]
+    dx_sum = state[_DX_SUM]
+    adx_value = state[_ADX]
+
+    # Rolling sums for the 50-close SMA and the 20-bar volume SMA
+    close_sum_50 = state[_CLOSE_SUM_50]
+    volume_sum_20 = state[_VOLUME_SUM_20]
+
+    for i in range(start, stop):
+        # Position in the series, for the warm-up conditions
+        t = i + offset
+        c = close[i]
+        h = high[i]
+        l = low[i]
+
+        # EMAs (span s: alpha = 2 / (s + 1))
+        if t > 0:
+            e9 = (1.0 - 2.0 / 10.0) * e9 + (2.0 / 10.0) * c
+            e21 = (1.0 - 2.0 / 22.0) * e21 + (2.0 / 22.0) * c
+            e50 = (1.0 - 2.0 / 51.0) * e50 + (2.0 / 51.0) * c
+            e200 = (1.0 - 2.0 / 201.0) * e200 + (2.0 / 201.0) * c
+            e12 = (1.0 - 2.0 / 13.0) * e12 + (2.0 / 13.0) * c
+            e26 = (1.0 - 2.0 / 27.0) * e26 + (2.0 / 27.0) * c
+        if t >= 8:
+            ema_9[i] = e9
+        if t >= 20:
+            ema_21[i] = e21
+        if t >= 49:
+            ema_50[i] = e50
+        if t >= 199:
+            ema_200[i] = e200
+
+        # MACD (12, 26) and its 9-period signal, which starts at the first MACD value
+        if t >= 25:
+            m = e12 - e26
+            macd[i] = m
+            if t == 25:
+                signal = m
+            else:
+                signal = (1.0 - 2.0 / 10.0) * signal + (2.0 / 10.0) * m
+            if t >= 33:
+                macd_signal[i] = signal
+                macd_diff[i] = m - signal
+
+        # RSI
+        if t > 0:
+            delta = c - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (1.0 - 1.0 / w) * avg_gain + gain / w
+            avg_loss = (1.0 - 1.0 / w) * avg_loss + loss / w
+        if t >= w - 1:
+            rsi[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # SMA 20 and Bollinger Bands (20, 2). Two passes over the window: a sliding
+        # update of the squared deviations cancels badly at IRT price levels and
+        # leaves a nonzero band width on flat stretches
+        if t >= 19:
+            window_sum = 0.0
+            for j in range(i - 19, i + 1):
+                window_sum += close[j]
+            bb_mean = window_sum / 20.0
+            sq_sum = 0.0
+            for j in range(i - 19, i + 1):
+                sq_sum += (close[j] - bb_mean) * (close[j] - bb_mean)
+            std = np.sqrt(sq_sum / 20.0)
+            sma_20[i] = bb_mean
+            bb_mid[i] = bb_mean
+            bb_high[i] = bb_mean + 2.0 * std
+            bb_low[i] = bb_mean - 2.0 * std
+
+        # SMA 50 and volume SMA 20
+        close_sum_50 += c
+        if t >= 50:
+            close_sum_50 -= close[i - 50]
+        if t >= 49:
+            sma_50[i] = close_sum_50 / 50.0
+        volume_sum_20 += volume[i]
+        if t >= 20:
+            volume_sum_20 -= volume[i - 20]
+        if t >= 19:
+            volume_sma[i] = volume_sum_20 / 20.0
+
+        # Momentum (10-period rate of change)
+        if t >= 10:
+            momentum[i] = (c - close[i - 10]) / close[i - 10] * 100.0
+
+        # ATR: true range of the first bar is just high - low
+        if t == 0:
+            true_range = h - l
+        else:
+            prev_close = close[i - 1]
+            true_range = max(h - l, abs(h - prev_close), abs(l - prev_close))
+        if t < w:
+            atr_value += true_range
+            if t == w - 1:
+                atr_value /= w
+                atr[i] = atr_value
+        else:
+            atr_value = (atr_value * (w - 1) + true_range) / w
+            atr[i] = atr_value
+
+        # ADX: directional movement is undefined on the first bar
+        if t > 0:
+            up_move = h - high[i - 1]
+            down_move = low[i - 1] - l
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+            if t <= w:
+                tr_sum += true_range
+                dm_pos += plus_dm
+                dm_neg += minus_dm
+            else:
+                tr_sum += true_range - tr_sum / w
+                dm_pos += plus_dm - dm_pos / w
+                dm_neg += minus_dm - dm_neg / w
+
+            if t >= w:
+                di_pos = 100.0 * dm_pos / tr_sum if tr_sum != 0 else 0.0
+                di_neg = 100.0 * dm_neg / tr_sum if tr_sum != 0 else 0.0
+                di_total = di_pos + di_neg
+                dx = 100.0 * abs(di_pos - di_neg) / di_total if di_total != 0 else 0.0
+                if t < 2 * w - 1:
+                    dx_sum += dx
+                elif t == 2 * w - 1:
+                    adx_value = (dx_sum + dx) / w
+                    adx[i] = adx_value
+                else:
+                    adx_value = (adx_value * (w - 1) + dx) / w
+                    adx[i] = adx_value
+
+        # Stochastic oscillator (14, 3) and Williams %R (14) over the same window
+        if t >= w - 1:
+            lowest = l
+            highest = h
+            for j in range(i - w + 1, i):
+                if low[j] < lowest:
+                    lowest = low[j]
+                if high[j] > highest:
+                    highest = high[j]
+            price_range = highest - lowest
+            if price_range != 0:
+                stoch_k[i] = 100.0 * (c - lowest) / price_range
+                williams_r[i] = -100.0 * (highest - c) / price_range
+            if t >= w + 1:
+                stoch_d[i] = (stoch_k[i] + stoch_k[i - 1] + stoch_k[i - 2]) / 3.0
+
+    state[_E9] = e9
+    state[_E21] = e21
+    state[_E50] = e50
+    state[_E200] = e200
+    state[_E12] = e12
+    state[_E26] = e26
+    state[_SIGNAL] = signal
+    state[_AVG_GAIN] = avg_gain
+    state[_AVG_LOSS] = avg_loss
+    state[_ATR] = atr_value
+    state[_TR_SUM] = tr_sum
+    state[_DM_POS] = dm_pos
+    state[_DM_NEG] = dm_neg
+    state[_DX_SUM] = dx_sum
+    state[_ADX] = adx_value
+    state[_CLOSE_SUM_50] = close_sum_50
+    state[_VOLUME_SUM_20] = volume_sum_20
@@ -0,0 +1,20 @@
+"""
+Optional Numba JIT support for Pishgoo
+
+Hot numeric loops are decorated with ``njit`` from this module. When numba is
+installed they are compiled to machine code; otherwise the decorator is a no-op
+and the same functions run as plain Python.
+"""
+
+# Optional import for numba
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -2,43 +2,82 @@
 Helper utilities for Pishgoo
 """
 
+import os
+import random
 import time
+import requests
 from typing import Callable, Any, Optional
 from functools import wraps
 from utils.logger import setup_logger
 
+# Optional import for threadpoolctl (installed with scikit-learn)
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
 logger = setup_logger(__name__)
 
+# Candle length in seconds per timeframe
+TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "4h": 14400, "1d": 86400}
+
+# HTTP client errors that are transient (request timeout, rate limited)
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 429})
+
+# Thread pool sizes read by OpenMP / BLAS, XGBoost, TensorFlow and joblib (RandomForest n_jobs=-1)
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                   'TF_NUM_INTRAOP_THREADS', 'LOKY_MAX_CPU_COUNT')
+
 
-def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed call is worth retrying (client errors other than 408 / 429 are not)"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return not (400 <= status < 500) or status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+def retry(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 30.0):
     """
     Retry decorator for API calls
     
+    Waits between attempts use decorrelated jitter (each wait is drawn
+    between delay and three times the previous wait, capped at max_delay),
+    so concurrent callers failing together do not retry in lockstep.
+    HTTP client errors other than 408 and 429 are raised immediately.
+    
     Args:
         max_attempts: Maximum number of retry attempts
-        delay: Initial delay between retries (seconds)
-        backoff: Backoff multiplier
+        delay: Minimum delay between retries (seconds)
+        max_delay: Maximum delay between retries (seconds)
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            attempt = 0
-            current_delay = delay
+            # Fast path: the first attempt needs no retry bookkeeping
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = e
             
-            while attempt < max_attempts:
+            current_delay = delay
+            for attempt in range(1, max_attempts):
+                if not _is_retryable(error):
+                    logger.error(f" {func.__name__} failed with a non-retryable error: {error}")
+                    raise error
+                
+                current_delay = random.uniform(delay, min(max_delay, current_delay * 3))
+                logger.warning(f" {func.__name__} attempt {attempt} failed: {error}. Retrying in {current_delay:.1f}s...")
+                time.sleep(current_delay)
+                
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    attempt += 1
-                    if attempt >= max_attempts:
-                        logger.error(f" {func.__name__} failed after {max_attempts} attempts: {e}")
-                        raise
-                    
-                    logger.warning(f" {func.__name__} attempt {attempt} failed: {e}. Retrying in {current_delay}s...")
-                    time.sleep(current_delay)
-                    current_delay *= backoff
+                    error = e
             
-            return None
+            logger.error(f" {func.__name__} failed after {max_attempts} attempts: {error}")
+            raise error
         return wrapper
     return decorator
 
@@ -50,6 +89,25 @@ def format_currency(value: float, currency: str = "IRT") -> str:
     return f"{value:.2f} {currency}"
 
 
+def limit_threads(threads: int):
+    """
+    Cap the native thread pools of the current process
+    
+    Meant as a worker process initializer: it runs in the child before the
+    task's module is imported, so the libraries size their pools from the
+    environment. Pools of libraries that are already loaded (e.g. imported by
+    the main script a spawned child re-runs) are capped via threadpoolctl.
+    Variables the user already set are left alone.
+    
+    Args:
+        threads: Maximum threads per pool
+    """
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(threads))
+    if THREADPOOLCTL_AVAILABLE:
+        threadpool_limits(limits=threads)
+
+
 def calculate_percentage_change(old_value: float, new_value: float) -> float:
     """Calculate percentage change"""
     if old_value == 0:
@@ -4,12 +4,38 @@ Technical indicators for Pishgoo
 
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Tuple, Union
+from utils._indicator_kernel import compute_indicators, INDICATOR_COLUMNS, LOOKBACK, STATE_SIZE
 from utils.logger import setup_logger
 
+# Optional import for polars (indicators on Polars frames)
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+    pl = None
+
 logger = setup_logger(__name__)
 
+# Indicator columns read by get_signal_strength
+SIGNAL_COLUMNS = ('rsi', 'macd', 'macd_signal', 'ema_9', 'ema_21', 'close', 'bb_low', 'bb_high')
+
+
+def _with_indicators(df: pd.DataFrame, values: np.ndarray) -> pd.DataFrame:
+    """
+    Join a (len(INDICATOR_COLUMNS), len(df)) block of indicator values onto df
+    
+    df is not copied: its columns are shared with the result, which only adds
+    the indicator columns. Stale indicator columns are dropped first, which
+    is the only case that rebuilds df.
+    """
+    columns = list(INDICATOR_COLUMNS)
+    if df.columns.isin(columns).any():
+        df = df.drop(columns=columns, errors='ignore')
+    indicators = pd.DataFrame(values.T, index=df.index, columns=columns)
+    return pd.concat([df, indicators], axis=1)
+
 
 class TechnicalIndicators:
     """Calculate technical indicators for trading signals"""
@@ -29,125 +55,104 @@ class TechnicalIndicators:
             logger.warning("Insufficient data for indicators")
             return df
         
-        result_df = df.copy()
-        
         try:
-            # RSI (Relative Strength Index)
-            result_df['rsi'] = ta.momentum.RSIIndicator(result_df['close']).rsi()
-            
-            # MACD (Moving Average Convergence Divergence)
-            macd = ta.trend.MACD(result_df['close'])
-            result_df['macd'] = macd.macd()
-            result_df['macd_signal'] = macd.macd_signal()
-            result_df['macd_diff'] = macd.macd_diff()
-            
-            # EMAs (Exponential Moving Averages)
-            result_df['ema_9'] = ta.trend.EMAIndicator(result_df['close'], window=9).ema_indicator()
-            result_df['ema_21'] = ta.trend.EMAIndicator(result_df['close'], window=21).ema_indicator()
-            result_df['ema_50'] = ta.trend.EMAIndicator(result_df['close'], window=50).ema_indicator()
-            result_df['ema_200'] = ta.trend.EMAIndicator(result_df['close'], window=200).ema_indicator()
-            
-            # SMA (Simple Moving Averages)
-            result_df['sma_20'] = ta.trend.SMAIndicator(result_df['close'], window=20).sma_indicator()
-            result_df['sma_50'] = ta.trend.SMAIndicator(result_df['close'], window=50).sma_indicator()
-            
-            # Bollinger Bands
-            bb = ta.volatility.BollingerBands(result_df['close'], window=20, window_dev=2)
-            result_df['bb_high'] = bb.bollinger_hband()
-            result_df['bb_low'] = bb.bollinger_lband()
-            result_df['bb_mid'] = bb.bollinger_mavg()
-            
-            # ATR (Average True Range)
-            result_df['atr'] = ta.volatility.AverageTrueRange(
-                result_df['high'], result_df['low'], result_df['close']
-            ).average_true_range()
-            
-            # Momentum
-            result_df['momentum'] = ta.momentum.ROCIndicator(result_df['close'], window=10).roc()
+            # One contiguous (4, n) block (a writable copy); each row is a contiguous input array
+            prices = np.array(df[['high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64).T, order='C')
+            values = np.empty((len(INDICATOR_COLUMNS), len(df)), dtype=np.float64)
+            compute_indicators(prices[0], prices[1], prices[2], prices[3], values,
+                               0, len(df), 0, np.zeros(STATE_SIZE))
             
-            # Volume indicators
-            result_df['volume_sma'] = ta.volume.VolumeSMAIndicator(
-                result_df['close'], result_df['volume']
-            ).volume_sma()
+            result_df = _with_indicators(df, values)
+            logger.debug("Technical indicators calculated successfully")
+            return result_df
             
-            # ADX (Average Directional Index)
-            result_df['adx'] = ta.trend.ADXIndicator(
-                result_df['high'], result_df['low'], result_df['close']
-            ).adx()
+        except Exception as e:
+            logger.error(f"Error calculating indicators: {e}")
+            return df.copy()
+    
+    @staticmethod
+    def calculate_all_polars(df: 'pl.DataFrame') -> 'pl.DataFrame':
+        """
+        Calculate all technical indicators on a Polars DataFrame
+        
+        Runs the same compiled kernel as calculate_all on the frame's columns,
+        so the values match it exactly; NaN warm-up values become nulls.
+        
+        Args:
+            df: Polars DataFrame with OHLCV data (columns: open, high, low, close, volume)
             
-            # Stochastic Oscillator
-            stoch = ta.momentum.StochasticOscillator(
-                result_df['high'], result_df['low'], result_df['close']
+        Returns:
+            Polars DataFrame with added indicator columns
+        """
+        if not POLARS_AVAILABLE:
+            logger.warning("Polars not available, cannot calculate indicators on a Polars frame")
+            return df
+        
+        if df.is_empty() or df.height < 20:
+            logger.warning("Insufficient data for indicators")
+            return df
+        
+        try:
+            prices = np.array(
+                df.select(['high', 'low', 'close', 'volume']).cast(pl.Float64).to_numpy().T, order='C'
             )
-            result_df['stoch_k'] = stoch.stoch()
-            result_df['stoch_d'] = stoch.stoch_signal()
-            
-            # Williams %R
-            result_df['williams_r'] = ta.momentum.WilliamsRIndicator(
-                result_df['high'], result_df['low'], result_df['close']
-            ).williams_r()
+            values = np.empty((len(INDICATOR_COLUMNS), df.height), dtype=np.float64)
+            compute_indicators(prices[0], prices[1], prices[2], prices[3], values,
+                               0, df.height, 0, np.zeros(STATE_SIZE))
             
+            result_df = df.with_columns([
+                pl.Series(name, values[row], nan_to_null=True) for row, name in enumerate(INDICATOR_COLUMNS)
+            ])
             logger.debug("Technical indicators calculated successfully")
+            return result_df
             
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}")
-        
-        return result_df
+            return df
     
     @staticmethod
-    def get_signal_strength(df: pd.DataFrame) -> Dict[str, float]:
+    def get_signal_strength(df: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> Dict[str, float]:
         """
         Get overall signal strength from indicators
         
         Args:
-            df: DataFrame with indicators
+            df: DataFrame with indicators, or a mapping of column name to numpy array
             
         Returns:
             Dictionary with signal strength scores
         """
-        if df.empty or 'rsi' not in df.columns:
+        is_frame = isinstance(df, pd.DataFrame)
+        columns = df.columns if is_frame else df.keys()
+        if 'rsi' not in columns or (len(df) if is_frame else len(df['rsi'])) == 0:
             return {"buy": 0.0, "sell": 0.0, "hold": 1.0}
         
-        latest = df.iloc[-1]
-        
-        buy_signals = 0
-        sell_signals = 0
-        total_signals = 0
-        
-        # RSI signals
-        if 'rsi' in df.columns and pd.notna(latest['rsi']):
-            total_signals += 1
-            if latest['rsi'] < 30:
-                buy_signals += 1
-            elif latest['rsi'] > 70:
-                sell_signals += 1
-        
-        # MACD signals
-        if all(col in df.columns for col in ['macd', 'macd_signal']) and \
-           pd.notna(latest['macd']) and pd.notna(latest['macd_signal']):
-            total_signals += 1
-            if latest['macd'] > latest['macd_signal']:
-                buy_signals += 1
-            else:
-                sell_signals += 1
+        # Read the last value of each signal column; missing columns read as NaN,
+        # and NaN checks below are self-comparisons (x == x)
+        nan = float('nan')
+        if is_frame:
+            # One row read, with labels mapped to positions by hash lookup, instead
+            # of building a Series per column
+            row = df.iloc[-1].to_numpy()
+            latest = [row[df.columns.get_loc(col)] if col in columns else nan for col in SIGNAL_COLUMNS]
+        else:
+            latest = [np.asarray(df[col])[-1] if col in columns else nan for col in SIGNAL_COLUMNS]
+        rsi, macd, macd_signal, ema_9, ema_21, close, bb_low, bb_high = map(float, latest)
         
-        # EMA crossover
-        if all(col in df.columns for col in ['ema_9', 'ema_21']) and \
-           pd.notna(latest['ema_9']) and pd.notna(latest['ema_21']):
-            total_signals += 1
-            if latest['ema_9'] > latest['ema_21']:
-                buy_signals += 1
-            else:
-                sell_signals += 1
+        # Tally with boolean arithmetic instead of a branch per indicator, as
+        # get_signal_scores does over whole columns. Comparisons with NaN are
+        # False, so only the "not above" sides need the validity flag
+        rsi_valid = rsi == rsi
+        macd_valid = (macd == macd) & (macd_signal == macd_signal)
+        ema_valid = (ema_9 == ema_9) & (ema_21 == ema_21)
+        bb_valid = all(col in columns for col in ('close', 'bb_low', 'bb_high')) & (close == close)
+        macd_up = macd > macd_signal
+        ema_up = ema_9 > ema_21
+        below_bb = bb_valid & (close < bb_low)
         
-        # Bollinger Bands
-        if all(col in df.columns for col in ['close', 'bb_low', 'bb_high']) and \
-           pd.notna(latest['close']):
-            total_signals += 1
-            if latest['close'] < latest['bb_low']:
-                buy_signals += 1
-            elif latest['close'] > latest['bb_high']:
-                sell_signals += 1
+        total_signals = rsi_valid + macd_valid + ema_valid + bb_valid
+        buy_signals = (rsi < 30) + macd_up + ema_up + below_bb
+        sell_signals = ((rsi > 70) + (macd_valid & (not macd_up)) + (ema_valid & (not ema_up))
+                        + (bb_valid & (not below_bb) & (close > bb_high)))
         
         if total_signals == 0:
             return {"buy": 0.0, "sell": 0.0, "hold": 1.0}
@@ -170,4 +175,179 @@ class TechnicalIndicators:
             "hold": 1.0 - max(buy_score, sell_score),
             "confidence": max(buy_score, sell_score)
         }
+    
+    @staticmethod
+    def get_signal_scores(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized get_signal_strength over every row of the DataFrame
+        
+        Row i scores exactly as get_signal_strength(df.iloc[:i+1]) would,
+        but all rows are computed in a single pass over the columns.
+        
+        Args:
+            df: DataFrame with indicators
+        
+        Returns:
+            Tuple of (buy_score, sell_score) arrays, one entry per row
+        """
+        n = len(df)
+        if n == 0 or 'rsi' not in df.columns:
+            return np.zeros(n), np.zeros(n)
+        
+        def column(name: str) -> np.ndarray:
+            if name in df.columns:
+                return df[name].to_numpy(dtype=np.float64)
+            return np.full(n, np.nan)
+        
+        buy_signals = np.zeros(n)
+        sell_signals = np.zeros(n)
+        total_signals = np.zeros(n)
+        
+        # RSI signals
+        rsi = column('rsi')
+        valid = ~np.isnan(rsi)
+        total_signals += valid
+        buy_signals += valid & (rsi < 30)
+        sell_signals += valid & (rsi > 70)
+        
+        # MACD signals
+        macd, macd_signal = column('macd'), column('macd_signal')
+        valid = ~np.isnan(macd) & ~np.isnan(macd_signal)
+        total_signals += valid
+        buy_signals += valid & (macd > macd_signal)
+        sell_signals += valid & ~(macd > macd_signal)
+        
+        # EMA crossover
+        ema_9, ema_21 = column('ema_9'), column('ema_21')
+        valid = ~np.isnan(ema_9) & ~np.isnan(ema_21)
+        total_signals += valid
+        buy_signals += valid & (ema_9 > ema_21)
+        sell_signals += valid & ~(ema_9 > ema_21)
+        
+        # Bollinger Bands
+        if all(col in df.columns for col in ['close', 'bb_low', 'bb_high']):
+            close = column('close')
+            valid = ~np.isnan(close)
+            total_signals += valid
+            buy_signals += valid & (close < column('bb_low'))
+            sell_signals += valid & (close > column('bb_high'))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            buy_score = np.where(total_signals > 0, buy_signals / total_signals, 0.0)
+            sell_score = np.where(total_signals > 0, sell_signals / total_signals, 0.0)
+        
+        return buy_score, sell_score
+
 
+class IncrementalIndicators:
+    """
+    Indicators for one symbol's candle series, updated as candles arrive
+    
+    The first update computes the whole window like calculate_all. Later
+    updates resume the compiled kernel from its saved state and only compute
+    the candles newer than the last one seen, so the cost per update does
+    not grow with the window. The newest candle of each update is treated as
+    still forming: it is computed from a copy of the state and recomputed on
+    the next update.
+    
+    Values are those of calculate_all over the whole series seen so far
+    (the first window plus every later candle). For the long EMAs this is
+    closer to the true average than recomputing a fixed window seeded at its
+    first candle, so values differ slightly from calculate_all on the same
+    window.
+    """
+    
+    def __init__(self, max_bars: int = 2000):
+        """
+        Initialize incremental indicators
+        
+        Args:
+            max_bars: Closed candles to keep; older ones are dropped from the buffers
+        """
+        self.max_bars = max(max_bars, LOOKBACK)
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget the series; the next update starts from scratch"""
+        capacity = 2 * self.max_bars
+        self._prices = np.empty((4, capacity), dtype=np.float64)
+        self._values = np.empty((len(INDICATOR_COLUMNS), capacity), dtype=np.float64)
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._state = np.zeros(STATE_SIZE, dtype=np.float64)
+        self._n = 0  # closed candles in the buffers
+        self._offset = 0  # closed candles dropped from the front
+    
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add indicators to the latest OHLCV window of the series
+        
+        Args:
+            df: DataFrame with OHLCV data and a DatetimeIndex, oldest candle first
+            
+        Returns:
+            DataFrame with added indicator columns
+        """
+        if df.empty or len(df) < 20:
+            logger.warning("Insufficient data for indicators")
+            return df
+        
+        try:
+            times = df.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            
+            # Candles after the last closed one; start over if the window does not
+            # reach back to it (a gap), reaches back further than the buffers, or
+            # has nothing newer
+            first_new = 0
+            if self._n > 0 and len(df) <= self.max_bars:
+                last_closed = self._times[self._n - 1]
+                first_new = int(np.searchsorted(times, last_closed, side='right'))
+                if not 0 < first_new <= self._n or first_new == len(df) or times[first_new - 1] != last_closed:
+                    first_new = 0
+            if first_new == 0:
+                self.reset()
+            
+            n_new = len(df) - first_new
+            self._make_room(n_new)
+            
+            # Closed candles advance the state; the forming one works on a copy
+            n = self._n
+            stop = n + n_new
+            for row, col in enumerate(('high', 'low', 'close', 'volume')):
+                self._prices[row, n:stop] = df[col].to_numpy(dtype=np.float64)[first_new:]
+            self._times[n:stop] = times[first_new:]
+            high, low, close, volume = self._prices
+            compute_indicators(high, low, close, volume, self._values,
+                               n, stop - 1, self._offset, self._state)
+            compute_indicators(high, low, close, volume, self._values,
+                               stop - 1, stop, self._offset, self._state.copy())
+            self._n = stop - 1
+            
+            result_df = _with_indicators(df, self._values[:, stop - len(df):stop])
+            logger.debug(f"Technical indicators updated ({n_new} new candles)")
+            return result_df
+            
+        except Exception as e:
+            logger.error(f"Error updating indicators: {e}")
+            self.reset()
+            return TechnicalIndicators.calculate_all(df)
+    
+    def _make_room(self, n_new: int) -> None:
+        """Drop the oldest closed candles, growing the buffers if n_new more still do not fit"""
+        capacity = self._times.shape[0]
+        if self._n + n_new <= capacity:
+            return
+        
+        # Keep max_bars closed candles, which always covers the kernel's lookback
+        drop = max(self._n - self.max_bars, 0)
+        keep = self._n - drop
+        prices, values, times = self._prices, self._values, self._times
+        if keep + n_new > capacity:
+            # The new candles alone outgrow the buffers (a window longer than max_bars)
+            self._prices = np.empty((prices.shape[0], keep + n_new), dtype=np.float64)
+            self._values = np.empty((values.shape[0], keep + n_new), dtype=np.float64)
+            self._times = np.empty(keep + n_new, dtype=np.int64)
+        self._prices[:, :keep] = prices[:, drop:self._n]
+        self._values[:, :keep] = values[:, drop:self._n]
+        self._times[:keep] = times[drop:self._n]
+        self._n = keep
+        self._offset += drop
@@ -6,12 +6,31 @@ import logging
 import os
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 LOG_DIR = Path(__file__).parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
 
+# Formatter and handlers shared by every logger: one console stream and one
+# daily log file (opened on first write) for the whole process
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+_CONSOLE_HANDLER = logging.StreamHandler()
+_CONSOLE_HANDLER.setFormatter(_FORMATTER)
+
+_FILE_HANDLER = logging.FileHandler(
+    LOG_DIR / f"pishgoo_{datetime.now().strftime('%Y%m%d')}.log", encoding='utf-8', delay=True
+)
+_FILE_HANDLER.setLevel(logging.DEBUG)
+_FILE_HANDLER.setFormatter(_FORMATTER)
+
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str, log_level: int = logging.INFO) -> logging.Logger:
     """
     Setup logger with file and console handlers
@@ -30,30 +49,8 @@ def setup_logger(name: str, log_level: int = logging.INFO) -> logging.Logger:
     if logger.handlers:
         return logger
     
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    log_file = LOG_DIR / f"pishgoo_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # Console output is filtered by the logger's own level
+    logger.addHandler(_CONSOLE_HANDLER)
+    logger.addHandler(_FILE_HANDLER)
     
     return logger
-
-
-
-
-
-
-
@@ -92,6 +92,7 @@ TRANSLATIONS = {
         'training_started': 'Training started',
         'training_completed': 'Training completed successfully!',
         'training_failed': 'Training failed',
+        'training_incomplete': 'Training finished, but some models failed to train',
         'training_status': 'Training Status',
         'no_data_available': 'No data available for training. Check your API keys.',
         'no_market_data': 'No data available',
@@ -101,6 +102,10 @@ TRANSLATIONS = {
         'training_ml_models': 'Training ML models (RandomForest & XGBoost)...',
         'training_lstm': 'Training LSTM model...',
         'training_prophet': 'Training Prophet model...',
+        'changes_staged': 'Changes staged. Click "Save All" to write them.',
+        'unsaved_changes': 'You have unsaved changes',
+        'save_all': 'Save All',
+        'save_failed': 'Failed to save settings',
     },
     'fa': {
         'app_title': 'داشبورد معاملاتی پیشگو',
@@ -191,6 +196,7 @@ TRANSLATIONS = {
         'training_started': 'آموزش شروع شد',
         'training_completed': 'آموزش با موفقیت انجام شد!',
         'training_failed': 'آموزش ناموفق بود',
+        'training_incomplete': 'آموزش به پایان رسید، اما آموزش برخی مدل‌ها ناموفق بود',
         'training_status': 'وضعیت آموزش',
         'no_data_available': 'داده‌ای برای آموزش موجود نیست. کلیدهای API را بررسی کنید.',
         'no_market_data': 'داده‌ای در دسترس نیست',
@@ -200,6 +206,10 @@ TRANSLATIONS = {
         'training_ml_models': 'در حال آموزش مدل‌های ML (RandomForest & XGBoost)...',
         'training_lstm': 'در حال آموزش مدل LSTM...',
         'training_prophet': 'در حال آموزش مدل Prophet...',
+        'changes_staged': 'تغییرات ثبت شد. برای ذخیره روی «ذخیره همه» کلیک کنید.',
+        'unsaved_changes': 'تغییرات ذخیره‌نشده دارید',
+        'save_all': 'ذخیره همه',
+        'save_failed': 'ذخیره تنظیمات ناموفق بود',
     }
 }
 